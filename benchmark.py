@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+import argparse
+import datetime
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import name_generator
+
+SAMPLE_NAMES = ["Christopher Alexander Montgomery", "Ava Lee", "Yolanda Kyle Young", "Mary-Ann O'Ryan"]
+SAMPLE_DATES = ["11-29-1990", "01/01/2000", "07-04-1776", "12-31-2099"]
+
+def make_synthetic_name_store(name_count, seed=0):
+    """Return an in-memory name store of name_count random names per list"""
+    rng = random.Random(seed)
+    syllables = ["an", "bel", "cy", "dor", "el", "fa", "gy", "ha", "is", "jo", "ka", "ly",
+                 "mar", "ny", "o", "pe", "qui", "ra", "sy", "ta", "u", "vy", "wen", "xa", "ya", "zo"]
+
+    def make_names():
+        return [''.join(rng.choice(syllables) for _ in range(rng.randint(1, 4))).title()
+                for _ in range(name_count)]
+
+    return name_generator.NameStore.from_lists({key: make_names() for key in name_generator.NAME_STORE_LISTS})
+
+def search_benchmark(gender, target_components, max_results=10, name_store=None, target_numbers=[11, 22, 33]):
+    """Return a callable running one quiet find_master_number_names search"""
+    def run():
+        name_generator.find_master_number_names(
+            "11-29-1990", gender, "Young", target_numbers, target_components,
+            max_results, name_store=name_store
+        )
+    return run
+
+def get_benchmarks(quick=False):
+    """Return {name: (callable, operations_per_call)} for every benchmark"""
+    def each(function, values):
+        def run():
+            for value in values:
+                function(value)
+        return run, len(values)
+
+    benchmarks = {
+        'reduce_to_single_digit': each(name_generator.reduce_to_single_digit, range(1000)),
+        'calculate_life_path': each(name_generator.calculate_life_path, SAMPLE_DATES),
+        'get_vowels': each(name_generator.get_vowels, SAMPLE_NAMES),
+        'get_consonants': each(name_generator.get_consonants, SAMPLE_NAMES),
+        'calculate_soul_urge': each(name_generator.calculate_soul_urge, SAMPLE_NAMES),
+        'calculate_expression': each(name_generator.calculate_expression, SAMPLE_NAMES),
+        'calculate_personality': each(name_generator.calculate_personality, SAMPLE_NAMES),
+        'calculate_numerology_profile': (
+            lambda: [name_generator.calculate_numerology_profile(name, "11-29-1990") for name in SAMPLE_NAMES],
+            len(SAMPLE_NAMES)
+        ),
+    }
+
+    component_sets = {
+        'all': None,
+        'soul_urge': ['soul_urge'],
+        'expression_personality': ['expression', 'personality'],
+    }
+    for gender, gender_name in [('m', 'male'), ('f', 'female'), ('', 'neutral')]:
+        first_names, middle_names = name_generator.get_name_lists(gender)
+        combinations = len(first_names) * len(middle_names)
+        for components_name, target_components in component_sets.items():
+            benchmarks[f'search_{gender_name}_{components_name}_first10'] = (
+                search_benchmark(gender, target_components), 1
+            )
+            # Every combination is visited, so throughput is in combinations per second
+            benchmarks[f'search_{gender_name}_{components_name}_all'] = (
+                search_benchmark(gender, target_components, 10 ** 9, target_numbers=[33]), combinations
+            )
+
+    for name_count in ([500] if quick else [500, 2000]):
+        name_store = make_synthetic_name_store(name_count)
+        benchmarks[f'search_synthetic_{name_count}_first10'] = (
+            search_benchmark('m', None, name_store=name_store), 1
+        )
+        benchmarks[f'search_synthetic_{name_count}_all'] = (
+            search_benchmark('m', ['expression'], 10 ** 9, name_store, [33]), name_count * name_count
+        )
+
+    return benchmarks
+
+def measure(function, operations, min_time=0.2, repeat=5):
+    """Time function and return its median latency and throughput
+
+    Each of repeat samples calls function enough times to last about
+    min_time / repeat seconds.
+    """
+    function()  # warm up caches and lazy initialization
+
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat or calls >= 1 << 20:
+            break
+        calls *= 2
+
+    samples = [elapsed / calls]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        samples.append((time.perf_counter() - start) / calls)
+
+    latency = statistics.median(samples)
+    return {
+        'latency': latency,
+        'throughput': operations / latency if latency else float('inf'),
+        'best_latency': min(samples),
+        'calls_per_sample': calls,
+        'samples': repeat
+    }
+
+def run_benchmarks(name_filter=None, quick=False, min_time=0.2, repeat=5):
+    """Run the benchmarks whose name contains name_filter and return the report dict"""
+    report = {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': name_generator.np is not None,
+        'benchmarks': {}
+    }
+
+    for name, (function, operations) in get_benchmarks(quick).items():
+        if name_filter and name_filter not in name:
+            continue
+        result = measure(function, operations, min_time, repeat)
+        report['benchmarks'][name] = result
+        print(f"{name:<50} {result['latency'] * 1000:>11.4f} ms {result['throughput']:>15,.0f} ops/s",
+              file=sys.stderr)
+
+    return report
+
+def compare_reports(baseline, current, threshold=0.1):
+    """Return a list of (name, baseline_result, current_result, regressed) for benchmarks in both reports
+
+    A benchmark regresses when its throughput dropped or its latency grew by
+    more than threshold (a fraction of the baseline).
+    """
+    comparisons = []
+    for name, baseline_result in baseline['benchmarks'].items():
+        current_result = current['benchmarks'].get(name)
+        if current_result is None:
+            continue
+        regressed = (
+            current_result['throughput'] < baseline_result['throughput'] * (1 - threshold)
+            or current_result['latency'] > baseline_result['latency'] * (1 + threshold)
+        )
+        comparisons.append((name, baseline_result, current_result, regressed))
+    return comparisons
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the numerology hot paths")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="run the benchmarks and write a JSON report")
+    run_parser.add_argument('-o', '--output', help="JSON report file (default: stdout)")
+    run_parser.add_argument('-k', '--filter', help="only run benchmarks whose name contains this")
+    run_parser.add_argument('--quick', action='store_true', help="skip the largest synthetic corpora")
+    run_parser.add_argument('--min-time', type=float, default=0.2,
+                            help="approximate seconds spent per benchmark (default: 0.2)")
+    run_parser.add_argument('--repeat', type=int, default=5, help="timed samples per benchmark (default: 5)")
+
+    compare_parser = commands.add_parser('compare', help="compare a report against a baseline")
+    compare_parser.add_argument('baseline', help="baseline JSON report")
+    compare_parser.add_argument('current', help="JSON report to check")
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help="allowed slowdown as a fraction of the baseline (default: 0.1)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run_benchmarks(args.filter, args.quick, args.min_time, max(1, args.repeat))
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as report_file:
+                json.dump(report, report_file, indent=2)
+        else:
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.current, encoding='utf-8') as current_file:
+        current = json.load(current_file)
+
+    comparisons = compare_reports(baseline, current, args.threshold)
+    regressions = 0
+    for name, baseline_result, current_result, regressed in comparisons:
+        change = current_result['throughput'] / baseline_result['throughput'] - 1
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:<50} {baseline_result['throughput']:>15,.0f} -> {current_result['throughput']:>15,.0f} ops/s "
+              f"{change:>+8.1%} {flag}")
+        regressions += regressed
+
+    print(f"\n{regressions} of {len(comparisons)} benchmarks regressed by more than {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,45 @@
 #!/usr/bin/env python3
 
+import argparse
+import array
+import asyncio
+import calendar
+import collections
+import concurrent.futures
+import contextlib
+import cProfile
+import csv
+import datetime
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import mmap
+import os
+import pstats
+import random
+import shutil
+import struct
+import sys
+import time
+import urllib.parse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LETTER_VALUES = {
+    'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5, 'F': 6, 'G': 7, 'H': 8, 'I': 9,
+    'J': 1, 'K': 2, 'L': 3, 'M': 4, 'N': 5, 'O': 6, 'P': 7, 'Q': 8, 'R': 9,
+    'S': 1, 'T': 2, 'U': 3, 'V': 4, 'W': 5, 'X': 6, 'Y': 7, 'Z': 8
+}
+
 def get_letter_value(letter):
     """Convert letter to numerological value using Pythagorean system"""
-    letter_values = {
-        'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5, 'F': 6, 'G': 7, 'H': 8, 'I': 9,
-        'J': 1, 'K': 2, 'L': 3, 'M': 4, 'N': 5, 'O': 6, 'P': 7, 'Q': 8, 'R': 9,
-        'S': 1, 'T': 2, 'U': 3, 'V': 4, 'W': 5, 'X': 6, 'Y': 7, 'Z': 8
-    }
-    return letter_values.get(letter.upper(), 0)
+    return LETTER_VALUES.get(letter.upper(), 0)
 
 def reduce_to_single_digit(number):
     """Reduce number to single digit, preserving master numbers 11, 22, 33"""
@@ -105,6 +137,100 @@ def calculate_personality(name):
     total = sum(get_letter_value(consonant) for consonant in consonants)
     return reduce_to_single_digit(total)
 
+# Code point table for the profile kernel: vowels hold their value, other
+# ASCII characters hold minus their consonant value (0 for non-letters).
+# Y is handled separately since it can be either.
+_CODE_POINT_VALUES = [0] * 128
+for _letter, _value in LETTER_VALUES.items():
+    _CODE_POINT_VALUES[ord(_letter)] = _value if _letter in 'AEIOU' else -_value
+del _letter, _value
+_CODE_POINT_Y = ord('Y')
+
+# reduce_to_single_digit for every sum a realistic full name can reach
+_REDUCED_SUMS = [reduce_to_single_digit(total) for total in range(1024)]
+
+def reduce_letter_sum(total):
+    """reduce_to_single_digit through the precomputed reduction table"""
+    if total < len(_REDUCED_SUMS):
+        return _REDUCED_SUMS[total]
+    return reduce_to_single_digit(total)
+
+def get_name_part_sums(name_part):
+    """Return (vowel_sum, consonant_sum, starts_with_y, ends_with_vowel) for one part of a name
+
+    Single pass equivalent of get_vowels/get_consonants. The sums treat the part
+    as if it started the name, so a leading Y counts as a consonant.
+    ends_with_vowel is None when the part has no characters at all.
+    """
+    # Non-ASCII characters are worth 0 and are never vowels, just like '?'
+    codes = name_part.upper().replace(' ', '').encode('ascii', 'replace')
+    if not codes:
+        return 0, 0, False, None
+    
+    vowel_sum = 0
+    consonant_sum = 0
+    after_vowel = True
+    
+    for code in codes:
+        value = _CODE_POINT_VALUES[code]
+        if value > 0:
+            vowel_sum += value
+            after_vowel = True
+        elif code == _CODE_POINT_Y:
+            if after_vowel:
+                consonant_sum += 7
+            else:
+                vowel_sum += 7
+            after_vowel = False
+        else:
+            consonant_sum -= value
+            after_vowel = False
+    
+    return vowel_sum, consonant_sum, codes[0] == _CODE_POINT_Y, after_vowel
+
+class NumerologyProfile:
+    """Compact numerology profile produced by calculate_profile"""
+    
+    __slots__ = ('life_path', 'soul_urge', 'expression', 'personality')
+    
+    def __init__(self, life_path, soul_urge, expression, personality):
+        self.life_path = life_path
+        self.soul_urge = soul_urge
+        self.expression = expression
+        self.personality = personality
+    
+    def __eq__(self, other):
+        if not isinstance(other, NumerologyProfile):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+    
+    def __repr__(self):
+        return (f"NumerologyProfile(life_path={self.life_path}, soul_urge={self.soul_urge}, "
+                f"expression={self.expression}, personality={self.personality})")
+    
+    def as_tuple(self):
+        """Return (life_path, soul_urge, expression, personality)"""
+        return self.life_path, self.soul_urge, self.expression, self.personality
+    
+    def as_dict(self):
+        """Return the profile in the dict form used by calculate_numerology_profile"""
+        return {
+            'life_path': self.life_path,
+            'soul_urge': self.soul_urge,
+            'expression': self.expression,
+            'personality': self.personality
+        }
+
+def calculate_profile(full_name, life_path=None):
+    """Calculate Soul Urge, Expression and Personality in a single pass over the name"""
+    vowel_sum, consonant_sum, _, _ = get_name_part_sums(full_name)
+    return NumerologyProfile(
+        life_path,
+        reduce_letter_sum(vowel_sum),
+        reduce_letter_sum(vowel_sum + consonant_sum),
+        reduce_letter_sum(consonant_sum)
+    )
+
 def get_male_names():
     """Return list of popular male first names"""
     return [
@@ -222,17 +348,7 @@ def get_middle_names():
 
 def calculate_numerology_profile(full_name, birth_date):
     """Calculate complete numerology profile for a name"""
-    life_path = calculate_life_path(birth_date)
-    soul_urge = calculate_soul_urge(full_name)
-    expression = calculate_expression(full_name)
-    personality = calculate_personality(full_name)
-    
-    return {
-        'life_path': life_path,
-        'soul_urge': soul_urge,
-        'expression': expression,
-        'personality': personality
-    }
+    return calculate_profile(full_name, calculate_life_path(birth_date)).as_dict()
 
 def has_master_number(profile, target_numbers=[11, 22, 33]):
     """Check if profile contains any master numbers"""
@@ -242,100 +358,2117 @@ def has_master_number(profile, target_numbers=[11, 22, 33]):
             master_numbers.append((component, value))
     return master_numbers
 
-def find_master_number_names(birth_date, gender, last_name, target_numbers=[11, 22, 33], 
-                           target_components=None, max_results=10):
-    """Find name combinations that result in master numbers"""
+def get_master_numbers(profile, target_numbers, target_components):
+    """Return [(component, number)] for the target components of profile holding a target number"""
+    return [
+        (component, profile[component]) for component in target_components
+        if component in profile and profile[component] in target_numbers
+    ]
+
+def calculate_numerology_grid(first_names, middle_names, last_name, birth_date):
+    """Calculate profiles for every first × middle name combination at once
+
+    Returns {component: grid} where grid[i][j] is the value for
+    f"{first_names[i]} {middle_names[j]} {last_name}". Grids are NumPy integer
+    arrays when NumPy is installed and nested lists otherwise.
+    """
+    life_path = calculate_life_path(birth_date)
+    first_sums = [append_name_part(NAME_START_SUMS, get_name_part_sums(name)) for name in first_names]
+    middle_sums = [get_name_part_sums(name) for name in middle_names]
+    last_part_sums = get_name_part_sums(last_name)
+    
+    if np is None:
+        return _calculate_numerology_grid_python(first_sums, middle_sums, last_part_sums, life_path)
+    
+    shape = (len(first_names), len(middle_names))
+    first_vowels = np.array([sums[0] for sums in first_sums], dtype=np.int32).reshape(-1, 1)
+    first_consonants = np.array([sums[1] for sums in first_sums], dtype=np.int32).reshape(-1, 1)
+    first_ends_with_vowel = np.array([sums[2] for sums in first_sums], dtype=bool).reshape(-1, 1)
+    middle_vowels = np.array([sums[0] for sums in middle_sums], dtype=np.int32)
+    middle_consonants = np.array([sums[1] for sums in middle_sums], dtype=np.int32)
+    middle_starts_with_y = np.array([sums[2] for sums in middle_sums], dtype=bool)
+    middle_is_empty = np.array([sums[3] is None for sums in middle_sums], dtype=bool)
+    middle_ends_with_vowel = np.array([bool(sums[3]) for sums in middle_sums], dtype=bool)
+    last_vowels, last_consonants, last_starts_with_y, _ = last_part_sums
+    
+    # Same Y corrections as append_name_part, applied across the whole grid
+    middle_y_shift = 7 * (middle_starts_with_y & ~first_ends_with_vowel)
+    ends_with_vowel = np.where(middle_is_empty, first_ends_with_vowel, middle_ends_with_vowel)
+    last_y_shift = 7 * (last_starts_with_y & ~ends_with_vowel)
+    
+    vowel_sums = first_vowels + middle_vowels + (last_vowels + middle_y_shift + last_y_shift)
+    consonant_sums = first_consonants + middle_consonants + (last_consonants - middle_y_shift - last_y_shift)
+    total_sums = vowel_sums + consonant_sums
+    
+    largest_sum = int(max(vowel_sums.max(initial=0), consonant_sums.max(initial=0), total_sums.max(initial=0)))
+    reduced = np.array(
+        [reduce_letter_sum(total) for total in range(max(largest_sum + 1, len(_REDUCED_SUMS)))],
+        dtype=np.int8
+    )
+    
+    return {
+        'life_path': np.broadcast_to(np.int8(life_path), shape),
+        'soul_urge': reduced[vowel_sums],
+        'expression': reduced[total_sums],
+        'personality': reduced[consonant_sums]
+    }
+
+def _calculate_numerology_grid_python(first_sums, middle_sums, last_part_sums, life_path):
+    """Pure Python fallback for calculate_numerology_grid"""
+    grid = {'life_path': [], 'soul_urge': [], 'expression': [], 'personality': []}
+    
+    for sums in first_sums:
+        rows = {component: [] for component in grid}
+        for part_sums in middle_sums:
+            vowel_sum, consonant_sum, _ = append_name_part(append_name_part(sums, part_sums), last_part_sums)
+            rows['life_path'].append(life_path)
+            rows['soul_urge'].append(reduce_letter_sum(vowel_sum))
+            rows['expression'].append(reduce_letter_sum(vowel_sum + consonant_sum))
+            rows['personality'].append(reduce_letter_sum(consonant_sum))
+        for component, row in rows.items():
+            grid[component].append(row)
     
+    return grid
+
+def master_number_mask(grid, target_numbers=[11, 22, 33], target_components=None):
+    """Return a grid of booleans marking combinations with a master number in any target component"""
     if target_components is None:
         target_components = ['life_path', 'soul_urge', 'expression', 'personality']
+    components = [component for component in target_components if component in grid]
+    
+    if np is None:
+        rows = len(grid['life_path'])
+        columns = len(grid['life_path'][0]) if rows else 0
+        return [
+            [any(grid[component][i][j] in target_numbers for component in components) for j in range(columns)]
+            for i in range(rows)
+        ]
+    
+    mask = np.zeros(np.shape(grid['life_path']), dtype=bool)
+    for component in components:
+        mask |= np.isin(grid[component], target_numbers)
+    return mask
+
+# Name store file layout (all integers little-endian):
+#   header        NAME_STORE_HEADER
+#   offsets       uint32 × (name_count + 1), byte offsets into the string pool
+#   vowel sums    uint16 × name_count
+#   consonant sums uint16 × name_count
+#   flags         uint8 × name_count, padded to 4 bytes
+#   lists         uint32 name ids for each of NAME_STORE_LISTS, in list order
+#   string pool   UTF-8 names, each stored once
+NAME_STORE_MAGIC = b'NGNS'
+NAME_STORE_VERSION = 1
+NAME_STORE_HEADER = struct.Struct('<4sHHII' + 'I' * 4)
+NAME_STORE_LISTS = [('male', 'first'), ('female', 'first'), ('male', 'middle'), ('female', 'middle')]
+
+NAME_FLAG_STARTS_WITH_Y = 0x01
+NAME_FLAG_ENDS_WITH_VOWEL = 0x02
+NAME_FLAG_EMPTY = 0x04
+NAME_FLAG_MALE = 0x08
+NAME_FLAG_FEMALE = 0x10
+NAME_FLAG_FIRST = 0x20
+NAME_FLAG_MIDDLE = 0x40
+
+def get_builtin_name_lists():
+    """Return the built-in name lists keyed like NAME_STORE_LISTS"""
+    return {
+        ('male', 'first'): get_male_names(),
+        ('female', 'first'): get_female_names(),
+        ('male', 'middle'): get_male_middle_names(),
+        ('female', 'middle'): get_female_middle_names()
+    }
+
+def encode_name_store(name_lists):
+    """Encode {(gender, position): [names]} into name store bytes
+
+    Names that appear in several lists are stored once; each list keeps its
+    own order through an array of name ids.
+    """
+    name_ids = {}
+    flags = array.array('B')
+    list_ids = {}
+    
+    for gender, position in NAME_STORE_LISTS:
+        ids = array.array('I')
+        for name in name_lists.get((gender, position), []):
+            name_id = name_ids.setdefault(name, len(name_ids))
+            if name_id == len(flags):
+                flags.append(0)
+            flags[name_id] |= NAME_FLAG_MALE if gender == 'male' else NAME_FLAG_FEMALE
+            flags[name_id] |= NAME_FLAG_FIRST if position == 'first' else NAME_FLAG_MIDDLE
+            ids.append(name_id)
+        list_ids[(gender, position)] = ids
+    
+    offsets = array.array('I', [0])
+    vowel_sums = array.array('H')
+    consonant_sums = array.array('H')
+    pool = bytearray()
     
-    # Get appropriate name lists
+    for name, name_id in name_ids.items():
+        vowel_sum, consonant_sum, starts_with_y, ends_with_vowel = get_name_part_sums(name)
+        if max(vowel_sum, consonant_sum) > 0xFFFF:
+            raise ValueError(f"Name is too long for the name store: {name[:40]}...")
+        pool += name.encode('utf-8')
+        offsets.append(len(pool))
+        vowel_sums.append(vowel_sum)
+        consonant_sums.append(consonant_sum)
+        if starts_with_y:
+            flags[name_id] |= NAME_FLAG_STARTS_WITH_Y
+        if ends_with_vowel is None:
+            flags[name_id] |= NAME_FLAG_EMPTY
+        elif ends_with_vowel:
+            flags[name_id] |= NAME_FLAG_ENDS_WITH_VOWEL
+    
+    sections = [offsets, vowel_sums, consonant_sums, flags, *(list_ids[key] for key in NAME_STORE_LISTS)]
+    if sys.byteorder != 'little':
+        for section in sections:
+            section.byteswap()
+    
+    data = bytearray(NAME_STORE_HEADER.pack(
+        NAME_STORE_MAGIC, NAME_STORE_VERSION, 0, len(name_ids), len(pool),
+        *(len(list_ids[key]) for key in NAME_STORE_LISTS)
+    ))
+    for section in sections:
+        data += section.tobytes()
+        data += bytes(-len(data) % 4)
+    data += pool
+    return bytes(data)
+
+def build_name_store(csv_path, store_path):
+    """Build a name store file from a CSV with name, gender and position columns
+
+    gender is M, F or U (both) and position is first, middle or both. Names
+    keep the order of the CSV within each list. Returns the number of distinct names.
+    """
+    name_lists = {key: [] for key in NAME_STORE_LISTS}
+    genders = {'m': ['male'], 'f': ['female'], 'u': ['male', 'female']}
+    positions = {'first': ['first'], 'middle': ['middle'], 'both': ['first', 'middle']}
+    
+    with open(csv_path, newline='', encoding='utf-8') as csv_file:
+        for line_number, row in enumerate(csv.DictReader(csv_file), 2):
+            name = (row.get('name') or '').strip()
+            gender = (row.get('gender') or 'u').strip().lower()[:1]
+            position = (row.get('position') or 'both').strip().lower()
+            if not name or gender not in genders or position not in positions:
+                raise ValueError(f"Invalid name store row on line {line_number} of {csv_path}")
+            for list_gender in genders[gender]:
+                for list_position in positions[position]:
+                    name_lists[(list_gender, list_position)].append(name)
+    
+    data = encode_name_store(name_lists)
+    with open(store_path, 'wb') as store_file:
+        store_file.write(data)
+    return NAME_STORE_HEADER.unpack_from(data)[3]
+
+class NameStore:
+    """Read-only view of a name store, memory-mapped when opened from a file
+
+    Names are decoded from the string pool only when accessed, so opening a
+    store costs the same for any corpus size.
+    """
+    
+    def __init__(self, data, mapped_file=None):
+        self._data = data
+        self._mapped_file = mapped_file
+        magic, version, _, name_count, pool_size, *list_lengths = NAME_STORE_HEADER.unpack_from(data)
+        if magic != NAME_STORE_MAGIC or version != NAME_STORE_VERSION:
+            raise ValueError("Not a name store file or unsupported name store version")
+        
+        view = memoryview(data)
+        position = NAME_STORE_HEADER.size
+        
+        def take(typecode, count):
+            nonlocal position
+            section = view[position:position + count * struct.calcsize(typecode)]
+            position += len(section) + (-len(section) % 4)
+            if sys.byteorder == 'little':
+                return section.cast(typecode)
+            swapped = array.array(typecode, section.tobytes())
+            swapped.byteswap()
+            return swapped
+        
+        self.name_count = name_count
+        self._offsets = take('I', name_count + 1)
+        self._vowel_sums = take('H', name_count)
+        self._consonant_sums = take('H', name_count)
+        self._flags = take('B', name_count)
+        self._lists = {key: take('I', length) for key, length in zip(NAME_STORE_LISTS, list_lengths)}
+        self._pool = view[position:position + pool_size]
+        # NameListIndex pairs by gender, see get_name_list_indexes
+        self.name_list_indexes = {}
+    
+    @classmethod
+    def open(cls, store_path):
+        """Memory-map a name store file built by build_name_store"""
+        with open(store_path, 'rb') as store_file:
+            mapped_file = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped_file, mapped_file)
+    
+    @classmethod
+    def from_lists(cls, name_lists):
+        """Build an in-memory store from {(gender, position): [names]}"""
+        return cls(encode_name_store(name_lists))
+    
+    def close(self):
+        """Release the memory map of a store opened from a file"""
+        if self._mapped_file is not None:
+            # Views into the map must be released before it can be closed
+            for section in [self._offsets, self._vowel_sums, self._consonant_sums, self._flags,
+                            self._pool, *self._lists.values()]:
+                if isinstance(section, memoryview):
+                    section.release()
+            self._mapped_file.close()
+            self._mapped_file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def get_name(self, name_id):
+        """Return the name stored under name_id"""
+        return str(self._pool[self._offsets[name_id]:self._offsets[name_id + 1]], 'utf-8')
+    
+    def get_part_sums(self, name_id):
+        """Return the precomputed get_name_part_sums of a stored name"""
+        flags = self._flags[name_id]
+        if flags & NAME_FLAG_EMPTY:
+            return 0, 0, False, None
+        return (self._vowel_sums[name_id], self._consonant_sums[name_id],
+                bool(flags & NAME_FLAG_STARTS_WITH_Y), bool(flags & NAME_FLAG_ENDS_WITH_VOWEL))
+    
+    def get_flags(self, name_id):
+        """Return the NAME_FLAG_* bits of a stored name"""
+        return self._flags[name_id]
+    
+    def get_names(self, gender, position):
+        """Return one of NAME_STORE_LISTS as a lazy NameList"""
+        return NameList(self, self._lists[(gender, position)])
+    
+    def get_name_lists(self, gender):
+        """Return (first_names, middle_names) for the given gender, like get_name_lists"""
+        if gender.lower() in ['male', 'm', 'boy']:
+            return self.get_names('male', 'first'), self.get_names('male', 'middle')
+        elif gender.lower() in ['female', 'f', 'girl']:
+            return self.get_names('female', 'first'), self.get_names('female', 'middle')
+        else:
+            return (self.get_names('male', 'first') + self.get_names('female', 'first'),
+                    self.get_names('male', 'middle') + self.get_names('female', 'middle'))
+
+class NameList:
+    """Sequence of names backed by an array of name store ids"""
+    
+    def __init__(self, store, name_ids):
+        self.store = store
+        self.name_ids = name_ids
+    
+    def __len__(self):
+        return len(self.name_ids)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store.get_name(name_id) for name_id in self.name_ids[index]]
+        return self.store.get_name(self.name_ids[index])
+    
+    def __iter__(self):
+        return map(self.store.get_name, self.name_ids)
+    
+    def __add__(self, other):
+        if not isinstance(other, NameList) or other.store is not self.store:
+            return list(self) + list(other)
+        return NameList(self.store, array.array('I', self.name_ids) + array.array('I', other.name_ids))
+    
+    def iter_part_sums(self):
+        """Yield the precomputed get_name_part_sums of each name in list order"""
+        return map(self.store.get_part_sums, self.name_ids)
+
+_default_name_store = None
+
+def get_default_name_store():
+    """Return an in-memory name store holding the built-in name lists"""
+    global _default_name_store
+    if _default_name_store is None:
+        _default_name_store = NameStore.from_lists(get_builtin_name_lists())
+    return _default_name_store
+
+def iter_name_part_sums(names):
+    """Yield get_name_part_sums for each name, using precomputed sums for a NameList"""
+    if isinstance(names, NameList):
+        return names.iter_part_sums()
+    return map(get_name_part_sums, names)
+
+def get_name_lists(gender, name_store=None, constraints=None):
+    """Return (first_names, middle_names) for the given gender
+
+    Uses the built-in lists unless a NameStore is given. With NameConstraints
+    only the names passing them are returned, selected through the cached
+    get_name_list_indexes.
+    """
+    if constraints is not None:
+        if constraints.gender is not None:
+            gender = constraints.gender
+        first_index, middle_index = get_name_list_indexes(gender, name_store)
+        return first_index.select(constraints.first), middle_index.select(constraints.middle)
+    if name_store is not None:
+        return name_store.get_name_lists(gender)
     if gender.lower() in ['male', 'm', 'boy']:
-        first_names = get_male_names()
-        middle_names = get_male_middle_names()
+        return get_male_names(), get_male_middle_names()
     elif gender.lower() in ['female', 'f', 'girl']:
-        first_names = get_female_names()
-        middle_names = get_female_middle_names()
+        return get_female_names(), get_female_middle_names()
     else:
         # If gender not specified or other, use both lists
-        first_names = get_male_names() + get_female_names()
-        middle_names = get_middle_names()
+        return get_male_names() + get_female_names(), get_middle_names()
+
+class NamePartConstraints:
+    """Limits on the names allowed in one position (first or middle) of a search
+
+    initials is a string of allowed initial letters. min_length and max_length
+    bound the number of characters (inclusive). names lists the only names
+    allowed, which may include names missing from the name lists (e.g. a
+    family member's name); exclude lists names never to return.
+    """
     
-    results = []
-    combinations_checked = 0
+    def __init__(self, initials=None, min_length=None, max_length=None, names=None, exclude=()):
+        self.initials = initials.upper() if initials is not None else None
+        self.min_length = min_length
+        self.max_length = max_length
+        self.names = list(dict.fromkeys(names)) if names is not None else None
+        self.exclude = frozenset(exclude)
+        self._name_set = frozenset(self.names) if names is not None else None
     
-    print(f"Searching for names with master numbers {target_numbers} in components: {target_components}")
-    print(f"Checking {len(first_names)} first names × {len(middle_names)} middle names = {len(first_names) * len(middle_names)} combinations...")
-    print("This may take a moment...\n")
+    def accepts(self, name):
+        """Return whether name passes every constraint"""
+        if self._name_set is not None and name not in self._name_set:
+            return False
+        if self.initials is not None and (not name or name[0].upper() not in self.initials):
+            return False
+        if self.min_length is not None and len(name) < self.min_length:
+            return False
+        if self.max_length is not None and len(name) > self.max_length:
+            return False
+        return name not in self.exclude
+
+class NameConstraints:
+    """Constraints a search applies to its name lists before computing any profile
+
+    first and middle are NamePartConstraints (None allows every name); gender,
+    if given, replaces the gender of the search.
+    """
     
-    for first_name in first_names:
-        for middle_name in middle_names:
-            if len(results) >= max_results:
-                break
-                
-            combinations_checked += 1
-            if combinations_checked % 1000 == 0:
-                print(f"Checked {combinations_checked} combinations, found {len(results)} matches so far...")
+    def __init__(self, first=None, middle=None, gender=None):
+        self.first = first
+        self.middle = middle
+        self.gender = gender
+
+class NameListIndex:
+    """Positions of the names of one list bucketed by (initial, length)
+
+    Buckets hold uint32 positions rather than names, so an index over a name
+    store list costs 4 bytes per name. The letter sums of the names come
+    precomputed from the store, so selecting names never computes a profile.
+    """
+    
+    def __init__(self, names):
+        self.names = names
+        self.buckets = {}
+        for position, name in enumerate(names):
+            self.buckets.setdefault((name[:1].upper(), len(name)), array.array('I')).append(position)
+    
+    def find(self, name):
+        """Return the positions of name in the list"""
+        return [position for position in self.buckets.get((name[:1].upper(), len(name)), ())
+                if self.names[position] == name]
+    
+    def select(self, constraints):
+        """Return the names passing a NamePartConstraints in list order
+
+        Names given in constraints.names that are not in the list come last.
+        Only the positions under the most selective indexed constraint are
+        checked against the others.
+        """
+        if constraints is None:
+            return self.names
+        
+        candidates = []
+        if constraints.names is not None:
+            candidates.append([self.find(name) for name in constraints.names])
+        if constraints.initials is not None:
+            candidates.append([positions for (initial, _), positions in self.buckets.items()
+                               if initial and initial in constraints.initials])
+        if constraints.min_length is not None or constraints.max_length is not None:
+            candidates.append([
+                positions for (_, length), positions in self.buckets.items()
+                if (constraints.min_length is None or length >= constraints.min_length)
+                and (constraints.max_length is None or length <= constraints.max_length)
+            ])
+        
+        if candidates:
+            smallest = min(candidates, key=lambda position_lists: sum(map(len, position_lists)))
+            positions = sorted(itertools.chain.from_iterable(smallest))
+        else:
+            positions = range(len(self.names))
+        positions = [position for position in positions if constraints.accepts(self.names[position])]
+        
+        if isinstance(self.names, NameList):
+            selected = NameList(self.names.store, array.array('I', (self.names.name_ids[position] for position in positions)))
+        else:
+            selected = [self.names[position] for position in positions]
+        
+        if constraints.names is not None:
+            extra_names = [name for name in constraints.names if not self.find(name) and constraints.accepts(name)]
+            if extra_names:
+                selected = list(selected) + extra_names
+        return selected
+
+def get_name_list_indexes(gender, name_store=None):
+    """Return (first_index, middle_index) NameListIndex for the given gender
+
+    The indexes are built once and kept on the name store (the built-in lists
+    use get_default_name_store), so they go away with it.
+    """
+    if name_store is None:
+        name_store = get_default_name_store()
+    gender_key = normalize_gender(gender)
+    indexes = name_store.name_list_indexes.get(gender_key)
+    if indexes is None:
+        first_names, middle_names = name_store.get_name_lists(gender)
+        indexes = NameListIndex(first_names), NameListIndex(middle_names)
+        name_store.name_list_indexes[gender_key] = indexes
+    return indexes
+
+# Sums of an empty name: the start of a name behaves like a preceding vowel for Y
+NAME_START_SUMS = (0, 0, True)
+
+def append_name_part(name_sums, part_sums):
+    """Extend (vowel_sum, consonant_sum, ends_with_vowel) of a name with the sums of its next part
+
+    get_vowels and get_consonants strip spaces before looking at the previous
+    letter, so a Y starting a part is a vowel when the part before it does not
+    end in a vowel.
+    """
+    vowel_sum, consonant_sum, ends_with_vowel = name_sums
+    part_vowels, part_consonants, starts_with_y, part_ends_with_vowel = part_sums
+    
+    if starts_with_y and not ends_with_vowel:
+        part_vowels += 7
+        part_consonants -= 7
+    if part_ends_with_vowel is None:
+        part_ends_with_vowel = ends_with_vowel
+    
+    return vowel_sum + part_vowels, consonant_sum + part_consonants, part_ends_with_vowel
+
+def combine_name_part_sums(first_sums, second_sums):
+    """Return the get_name_part_sums of two name parts written one after the other"""
+    vowel_sum, consonant_sum, starts_with_y, ends_with_vowel = first_sums
+    if ends_with_vowel is None:
+        return second_sums
+    vowel_sum, consonant_sum, ends_with_vowel = append_name_part(
+        (vowel_sum, consonant_sum, ends_with_vowel), second_sums
+    )
+    return vowel_sum, consonant_sum, starts_with_y, ends_with_vowel
+
+def get_profile_from_sums(vowel_sum, consonant_sum, life_path):
+    """Build a numerology profile from the vowel and consonant sums of a full name"""
+    return {
+        'life_path': life_path,
+        'soul_urge': reduce_letter_sum(vowel_sum),
+        'expression': reduce_letter_sum(vowel_sum + consonant_sum),
+        'personality': reduce_letter_sum(consonant_sum)
+    }
+
+def get_name_result(first_name, middle_name, last_name, name_sums, life_path, target_numbers, target_components):
+    """Build the result dict of a first, middle and last name combination
+
+    name_sums are the (vowel_sum, consonant_sum, ends_with_vowel) of the full
+    name, as returned by append_name_part.
+    """
+    profile = get_profile_from_sums(name_sums[0], name_sums[1], life_path)
+    return {
+        'full_name': f"{first_name} {middle_name} {last_name}",
+        'first_name': first_name,
+        'middle_name': middle_name,
+        'profile': profile,
+        'master_numbers': get_master_numbers(profile, target_numbers, target_components)
+    }
+
+def index_name_parts(names, part_sums=None):
+    """Bucket names by their Y behaviour and by the letter sum behind each name component
+
+    Returns {(starts_with_y, ends_with_vowel): {component: {sum: [positions]}}}
+    with positions in list order. part_sums can pass in the names'
+    get_name_part_sums when they are already known.
+    """
+    if part_sums is None:
+        part_sums = iter_name_part_sums(names)
+    
+    index = {}
+    for position, (vowel_sum, consonant_sum, starts_with_y, ends_with_vowel) in enumerate(part_sums):
+        buckets = index.setdefault((starts_with_y, ends_with_vowel), {
+            'soul_urge': {}, 'expression': {}, 'personality': {}
+        })
+        buckets['soul_urge'].setdefault(vowel_sum, []).append(position)
+        buckets['expression'].setdefault(vowel_sum + consonant_sum, []).append(position)
+        buckets['personality'].setdefault(consonant_sum, []).append(position)
+    return index
+
+def join_name_index(name_sums, index, last_part_sums, target_numbers, target_components):
+    """Return the sorted positions of indexed names that give a master number between name_sums and the last name
+
+    Every name in a bucket gets the same Y correction, so each bucket is joined
+    against the target numbers on its sums alone instead of name by name.
+    """
+    matches = []
+    for (starts_with_y, ends_with_vowel), buckets in index.items():
+        # An empty part with the bucket's Y behaviour yields the bucket's offsets
+        vowel_offset, consonant_offset, _ = append_name_part(
+            append_name_part(name_sums, (0, 0, starts_with_y, ends_with_vowel)),
+            last_part_sums
+        )
+        offsets = {
+            'soul_urge': vowel_offset,
+            'expression': vowel_offset + consonant_offset,
+            'personality': consonant_offset
+        }
+        for component in target_components:
+            if component not in buckets:
+                continue
+            offset = offsets[component]
+            for part_sum, positions in buckets[component].items():
+                if reduce_letter_sum(offset + part_sum) in target_numbers:
+                    matches.append(positions)
+    
+    # Merge the sorted position lists, dropping names matched by several components
+    merged = []
+    for position in heapq.merge(*matches):
+        if not merged or merged[-1] != position:
+            merged.append(position)
+    return merged
+
+class SearchMetrics:
+    """Counters and per-stage timers collected for one search
+
+    Stages are 'load_lists' (name lists), 'prepare' (life path, letter sums
+    and middle name index), 'filter' (joining first names against the index)
+    and 'profiles' (building the profile of each match). Parallel searches
+    only record their total 'search' time since the work happens in workers.
+    """
+    
+    def __init__(self, query):
+        self.query = query
+        self.counters = {'combinations_total': 0, 'combinations_checked': 0, 'matches_found': 0}
+        self.matches_by_component = {}
+        self.timers = {}
+        self.profile = None
+    
+    def add_time(self, stage, seconds):
+        """Add seconds to a stage timer"""
+        self.timers[stage] = self.timers.get(stage, 0.0) + seconds
+    
+    @contextlib.contextmanager
+    def time_stage(self, stage):
+        """Context manager timing its block into a stage timer"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+    
+    def count_result(self, result):
+        """Count one match and the components it has master numbers in"""
+        self.counters['matches_found'] += 1
+        for component, _ in result['master_numbers']:
+            self.matches_by_component[component] = self.matches_by_component.get(component, 0) + 1
+    
+    def as_event(self):
+        """Return the metrics as a JSON-serializable 'search' event"""
+        event = {
+            'event': 'search',
+            'query': self.query,
+            'counters': self.counters,
+            'matches_by_component': self.matches_by_component,
+            'timers': self.timers
+        }
+        if self.profile is not None:
+            event['profile'] = self.profile
+        return event
+
+class NullMetricsSink:
+    """Metrics sink that drops every event; searches skip collecting metrics for it"""
+    
+    profile_sample_rate = 0.0
+    
+    def emit(self, event):
+        pass
+
+class MemoryMetricsSink:
+    """Metrics sink that keeps every event in its events list"""
+    
+    def __init__(self, profile_sample_rate=0.0):
+        self.profile_sample_rate = profile_sample_rate
+        self.events = []
+    
+    def emit(self, event):
+        self.events.append(event)
+
+class JsonLinesMetricsSink:
+    """Metrics sink that writes each event as one JSON line to a file or path"""
+    
+    def __init__(self, output, profile_sample_rate=0.0):
+        self.profile_sample_rate = profile_sample_rate
+        self._owns_output = isinstance(output, (str, os.PathLike))
+        self.output = open(output, 'a', encoding='utf-8') if self._owns_output else output
+    
+    def emit(self, event):
+        self.output.write(json.dumps(event, default=str) + '\n')
+        self.output.flush()
+    
+    def close(self):
+        if self._owns_output:
+            self.output.close()
+
+_metrics_sink = NullMetricsSink()
+
+def set_metrics_sink(sink):
+    """Send search metrics to sink (None restores the no-op sink) and return the previous one"""
+    global _metrics_sink
+    previous, _metrics_sink = _metrics_sink, sink if sink is not None else NullMetricsSink()
+    return previous
+
+def get_metrics_sink():
+    """Return the sink search metrics currently go to"""
+    return _metrics_sink
+
+def start_search_metrics(metrics_sink, **query):
+    """Return SearchMetrics for a search, or None when metrics_sink (or the global sink) is a no-op"""
+    if metrics_sink is None:
+        metrics_sink = _metrics_sink
+    if isinstance(metrics_sink, NullMetricsSink):
+        return None
+    return SearchMetrics(query)
+
+def summarize_profile(profiler, limit=20):
+    """Return the top functions of a cProfile run by cumulative time"""
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            'function': f"{os.path.basename(filename)}:{line_number}({function_name})",
+            'calls': calls,
+            'total_time': total_time,
+            'cumulative_time': cumulative_time
+        }
+        for (filename, line_number, function_name), (_, calls, total_time, cumulative_time, _) in rows
+    ]
+
+def prepare_name_search(birth_date, middle_names, last_name, target_numbers, target_components,
+                        life_path=None, last_part_sums=None, middle_part_sums=None, middle_index=None):
+    """Precompute everything a search needs that does not depend on the first name
+
+    Values already computed for another search (life path, last name sums,
+    middle name sums and index) can be passed in to share them.
+    """
+    if life_path is None:
+        life_path = calculate_life_path(birth_date)
+    if last_part_sums is None:
+        last_part_sums = get_name_part_sums(last_name)
+    if middle_part_sums is None:
+        middle_part_sums = list(iter_name_part_sums(middle_names))
+    
+    search = {
+        'middle_names': middle_names,
+        'middle_part_sums': middle_part_sums,
+        'last_name': last_name,
+        'last_part_sums': last_part_sums,
+        'life_path': life_path,
+        'target_numbers': target_numbers,
+        'target_components': target_components,
+        'every_middle_name': None,
+        'middle_index': None,
+        # Firsts with equal sums and ending share the same matching middle names
+        'matches_by_first_sums': {}
+    }
+    
+    # Life path does not depend on the name, so a hit there matches every middle name
+    if 'life_path' in target_components and life_path in target_numbers:
+        search['every_middle_name'] = list(range(len(middle_names)))
+    elif middle_index is not None:
+        search['middle_index'] = middle_index
+    else:
+        search['middle_index'] = index_name_parts(middle_names, middle_part_sums)
+    
+    return search
+
+def iter_first_name_matches(search, first_names, progress=None, metrics=None):
+    """Yield (combinations_checked, result) for each match of first_names in a prepared search
+
+    Matches come in first × middle list order; combinations_checked is the
+    number of combinations the original nested loop had visited at that match.
+    progress, if given, is called as progress(combinations_checked, matches_found)
+    after each first name. metrics, if given, gets the 'filter' and 'profiles'
+    stage times.
+    """
+    middle_names = search['middle_names']
+    middle_part_sums = search['middle_part_sums']
+    last_name = search['last_name']
+    last_part_sums = search['last_part_sums']
+    target_numbers = search['target_numbers']
+    target_components = search['target_components']
+    matches_by_first_sums = search['matches_by_first_sums']
+    matches_found = 0
+    
+    for first_position, (first_name, first_part_sums) in enumerate(zip(first_names, iter_name_part_sums(first_names))):
+        if metrics is not None:
+            stage_start = time.perf_counter()
+        
+        first_sums = append_name_part(NAME_START_SUMS, first_part_sums)
+        if search['every_middle_name'] is not None:
+            middle_positions = search['every_middle_name']
+        else:
+            middle_positions = matches_by_first_sums.get(first_sums)
+            if middle_positions is None:
+                middle_positions = join_name_index(
+                    first_sums, search['middle_index'], last_part_sums, target_numbers, target_components
+                )
+                matches_by_first_sums[first_sums] = middle_positions
+        
+        if metrics is not None:
+            metrics.add_time('filter', time.perf_counter() - stage_start)
+        
+        for middle_position in middle_positions:
+            if metrics is not None:
+                stage_start = time.perf_counter()
+            
+            result = get_name_result(
+                first_name, middle_names[middle_position], last_name,
+                append_name_part(append_name_part(first_sums, middle_part_sums[middle_position]), last_part_sums),
+                search['life_path'], target_numbers, target_components
+            )
             
-            full_name = f"{first_name} {middle_name} {last_name}"
-            profile = calculate_numerology_profile(full_name, birth_date)
+            if metrics is not None:
+                metrics.add_time('profiles', time.perf_counter() - stage_start)
+            matches_found += 1
+            yield first_position * len(middle_names) + middle_position + 1, result
+        
+        if progress is not None:
+            progress((first_position + 1) * len(middle_names), matches_found)
+
+def collect_matches(matches, max_results, total_combinations):
+    """Return (results, combinations_checked) for the first max_results (combinations_checked, result) matches
+
+    combinations_checked follows the original loop: it stops counting at the
+    last kept match, or covers every combination when fewer matches exist.
+    """
+    if max_results <= 0:
+        return [], 0
+    
+    matches = list(itertools.islice(matches, max_results))
+    results = [result for _, result in matches]
+    if len(results) < max_results:
+        return results, total_combinations
+    return results, matches[-1][0]
+
+# Prepared search shared by the shards running in one worker process
+_worker_search = None
+
+def _init_search_worker(birth_date, middle_names, last_name, target_numbers, target_components):
+    """Process pool initializer: prepare the search once per worker"""
+    global _worker_search
+    _worker_search = prepare_name_search(birth_date, middle_names, last_name, target_numbers, target_components)
+
+def _search_shard(first_names, max_results):
+    """Return the first max_results (combinations_checked, result) matches of one shard"""
+    return list(itertools.islice(iter_first_name_matches(_worker_search, first_names), max_results))
+
+def iter_first_name_matches_parallel(birth_date, first_names, middle_names, last_name, target_numbers,
+                                     target_components, max_results=None, workers=None, chunk_size=None,
+                                     progress=None):
+    """Shard first_names across a process pool and yield the matches back in list order
+
+    Yields the same (combinations_checked, result) pairs as iter_first_name_matches.
+    Shards are yielded in submission order while later ones are still running.
+    Each shard stops after max_results matches, and the remaining shards are
+    cancelled once the generator is closed. progress is called after each shard.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        # A few shards per worker keeps every core busy without much merge overhead
+        chunk_size = max(1, -(-len(first_names) // (workers * 4)))
+    
+    shards = (first_names[start:start + chunk_size] for start in range(0, len(first_names), chunk_size))
+    combinations_checked = 0
+    matches_found = 0
+    
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_search_worker,
+        # Name store lists are tied to their memory map, so workers get plain lists
+        initargs=(birth_date, list(middle_names), last_name, target_numbers, target_components)
+    )
+    try:
+        # Keep only a couple of shards per worker queued so huge corpora are not submitted at once
+        pending = collections.deque(
+            (len(shard), executor.submit(_search_shard, shard, max_results))
+            for shard in itertools.islice(shards, workers * 2)
+        )
+        while pending:
+            shard_length, future = pending.popleft()
+            for shard in itertools.islice(shards, 1):
+                pending.append((len(shard), executor.submit(_search_shard, shard, max_results)))
             
-            # Check if any of the target components have master numbers
-            master_numbers_found = []
-            for component in target_components:
-                if component in profile and profile[component] in target_numbers:
-                    master_numbers_found.append((component, profile[component]))
+            for shard_checked, result in future.result():
+                matches_found += 1
+                yield combinations_checked + shard_checked, result
             
-            if master_numbers_found:
-                results.append({
-                    'full_name': full_name,
-                    'first_name': first_name,
-                    'middle_name': middle_name,
-                    'profile': profile,
-                    'master_numbers': master_numbers_found
-                })
-        
-        if len(results) >= max_results:
+            combinations_checked += shard_length * len(middle_names)
+            if progress is not None:
+                progress(combinations_checked, matches_found)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_master_number_pairs(birth_date, gender, last_name, target_numbers=[11, 22, 33],
+                             target_components=None, max_results=None, workers=1, chunk_size=None,
+                             progress=None, name_store=None, metrics=None, constraints=None):
+    """Return (matches, combinations_total) for a search
+
+    matches yields (combinations_checked, result) for every match, see
+    iter_master_number_names; combinations_total is first × middle list size
+    after applying constraints.
+    """
+    if target_components is None:
+        target_components = ['life_path', 'soul_urge', 'expression', 'personality']
+    
+    stage_start = time.perf_counter()
+    first_names, middle_names = get_name_lists(gender, name_store, constraints)
+    combinations_total = len(first_names) * len(middle_names)
+    if metrics is not None:
+        metrics.add_time('load_lists', time.perf_counter() - stage_start)
+        metrics.counters['combinations_total'] = combinations_total
+    
+    if workers == 1:
+        stage_start = time.perf_counter()
+        search = prepare_name_search(birth_date, middle_names, last_name, target_numbers, target_components)
+        if metrics is not None:
+            metrics.add_time('prepare', time.perf_counter() - stage_start)
+        return iter_first_name_matches(search, first_names, progress, metrics), combinations_total
+    
+    # Validate the birth date before any worker starts
+    calculate_life_path(birth_date)
+    matches = iter_first_name_matches_parallel(
+        birth_date, first_names, middle_names, last_name, target_numbers,
+        target_components, max_results, workers, chunk_size, progress
+    )
+    return matches, combinations_total
+
+def _iter_results_with_metrics(matches, combinations_total, metrics, metrics_sink):
+    """Yield the results of matches, emitting the search metrics once iteration ends or stops"""
+    combinations_checked = 0
+    finished = False
+    start = time.perf_counter()
+    try:
+        for combinations_checked, result in matches:
+            metrics.count_result(result)
+            yield result
+        finished = True
+    finally:
+        matches.close()
+        metrics.counters['combinations_checked'] = combinations_total if finished else combinations_checked
+        metrics.add_time('search', time.perf_counter() - start)
+        metrics_sink.emit(metrics.as_event())
+
+def iter_master_number_names(birth_date, gender, last_name, target_numbers=[11, 22, 33],
+                             target_components=None, progress=None, workers=1, chunk_size=None,
+                             name_store=None, metrics_sink=None, constraints=None):
+    """Yield name combinations with master numbers as soon as each one is found
+
+    Results come in the same order as find_master_number_names and the search
+    stops as soon as the caller stops iterating. progress, if given, is called
+    as progress(combinations_checked, matches_found) while the search runs.
+    Search metrics go to metrics_sink (default: the set_metrics_sink sink) when
+    the iteration ends or is stopped. An invalid birth date raises ValueError
+    before the first result.
+    """
+    if metrics_sink is None:
+        metrics_sink = get_metrics_sink()
+    metrics = start_search_metrics(
+        metrics_sink, mode='iter', birth_date=birth_date, gender=gender, last_name=last_name,
+        target_numbers=target_numbers, target_components=target_components, workers=workers
+    )
+    
+    matches, combinations_total = iter_master_number_pairs(
+        birth_date, gender, last_name, target_numbers, target_components,
+        workers=workers, chunk_size=chunk_size, progress=progress, name_store=name_store,
+        metrics=metrics, constraints=constraints
+    )
+    if metrics is None:
+        return (result for _, result in matches)
+    return _iter_results_with_metrics(matches, combinations_total, metrics, metrics_sink)
+
+def find_master_number_names(birth_date, gender, last_name, target_numbers=[11, 22, 33], 
+                           target_components=None, max_results=10, workers=1, chunk_size=None,
+                           name_store=None, metrics_sink=None, constraints=None):
+    """Find name combinations that result in master numbers
+
+    With workers other than 1 the first names are split into shards of
+    chunk_size names and searched in a process pool (workers=None uses every
+    CPU). The results are identical to the single process search. name_store
+    replaces the built-in name lists with a NameStore corpus. constraints
+    (NameConstraints) narrow the first and middle names before the search.
+    
+    Counters and stage timers go to metrics_sink (default: the
+    set_metrics_sink sink) as one 'search' event. A sink only needs an
+    emit(event) method; its optional profile_sample_rate attribute is the
+    fraction of searches also run under cProfile.
+    """
+    
+    if target_components is None:
+        target_components = ['life_path', 'soul_urge', 'expression', 'personality']
+    if metrics_sink is None:
+        metrics_sink = get_metrics_sink()
+    metrics = start_search_metrics(
+        metrics_sink, mode='find', birth_date=birth_date, gender=gender, last_name=last_name,
+        target_numbers=target_numbers, target_components=target_components,
+        max_results=max_results, workers=workers
+    )
+    
+    profiler = None
+    if metrics is not None and random.random() < getattr(metrics_sink, 'profile_sample_rate', 0.0):
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    
+    try:
+        matches, combinations_total = iter_master_number_pairs(
+            birth_date, gender, last_name, target_numbers, target_components,
+            max_results, workers, chunk_size, name_store=name_store, metrics=metrics,
+            constraints=constraints
+        )
+        results, combinations_checked = collect_matches(matches, max_results, combinations_total)
+        matches.close()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    
+    if metrics is not None:
+        metrics.add_time('search', time.perf_counter() - start)
+        metrics.counters['combinations_checked'] = combinations_checked
+        for result in results:
+            metrics.count_result(result)
+        if profiler is not None:
+            metrics.profile = summarize_profile(profiler)
+        metrics_sink.emit(metrics.as_event())
+    
+    return results
+
+# Default weights for ranking matches, see find_ranked_master_number_names
+RANK_WEIGHTS = {
+    'master_components': 100.0,  # each component with a target number
+    'master_number': 1.0,        # times each target number found, so 33 outranks 11
+    'popularity': 10.0,          # times the popularity of the first and of the middle name
+    'length': -1.0               # each character of the first and of the middle name
+}
+
+def get_name_rank_score(name, popularity, weights):
+    """Return the part of a match's score that comes from one of its names"""
+    return weights['popularity'] * popularity.get(name, 0.0) + weights['length'] * len(name)
+
+def get_master_rank_score(master_numbers, weights):
+    """Return the part of a match's score that comes from its master numbers"""
+    score = 0.0
+    for _, number in master_numbers:
+        score += weights['master_components'] + weights['master_number'] * number
+    return score
+
+def find_ranked_master_number_names(birth_date, gender, last_name, target_numbers=[11, 22, 33],
+                                    target_components=None, max_results=10, popularity=None,
+                                    weights=None, name_store=None, constraints=None):
+    """Find the max_results best scoring name combinations with master numbers
+
+    A match scores the master number part (per component found and per master
+    number) plus the popularity and length parts of its first and middle
+    name, weighted by weights (see RANK_WEIGHTS). popularity maps names to a
+    weight, names missing from it count as 0. Results are best first with a
+    'score' key; equal scores keep list order.
+    
+    Only the best max_results matches are held, in a heap. First names and the
+    middle names each first name matches are visited from the best name score
+    down, so the scan stops as soon as the best score still reachable cannot
+    beat the current last result.
+    """
+    if target_components is None:
+        target_components = ['life_path', 'soul_urge', 'expression', 'personality']
+    if popularity is None:
+        popularity = {}
+    weights = dict(RANK_WEIGHTS, **(weights or {}))
+    
+    first_names, middle_names = get_name_lists(gender, name_store, constraints)
+    search = prepare_name_search(birth_date, middle_names, last_name, target_numbers, target_components)
+    if max_results <= 0 or not first_names or not middle_names:
+        return []
+    
+    middle_scores = [get_name_rank_score(name, popularity, weights) for name in middle_names]
+    middles_by_score = sorted(range(len(middle_names)), key=lambda position: (-middle_scores[position], position))
+    middle_ranks = [0] * len(middle_names)
+    for rank, position in enumerate(middles_by_score):
+        middle_ranks[position] = rank
+    best_middle_score = middle_scores[middles_by_score[0]]
+    
+    first_scores = [get_name_rank_score(name, popularity, weights) for name in first_names]
+    firsts_by_score = sorted(range(len(first_names)), key=lambda position: (-first_scores[position], position))
+    first_part_sums = list(iter_name_part_sums(first_names))
+    
+    # Highest master number part any match could get
+    best_master_score = 0.0
+    for component in ['life_path', 'soul_urge', 'expression', 'personality']:
+        if component in target_components:
+            best_master_score += max(0.0, max(
+                weights['master_components'] + weights['master_number'] * number for number in target_numbers
+            ))
+    
+    # Min-heap of (score, -combination) holding the best matches so far
+    ranked = []
+    middles_by_first_sums = {}
+    
+    for first_position in firsts_by_score:
+        first_bound = best_master_score + first_scores[first_position]
+        if len(ranked) == max_results and first_bound + best_middle_score < ranked[0][0]:
             break
+        
+        first_sums = append_name_part(NAME_START_SUMS, first_part_sums[first_position])
+        middle_positions = middles_by_first_sums.get(first_sums)
+        if middle_positions is None:
+            if search['every_middle_name'] is not None:
+                middle_positions = middles_by_score
+            else:
+                middle_positions = sorted(
+                    join_name_index(first_sums, search['middle_index'], search['last_part_sums'],
+                                    target_numbers, target_components),
+                    key=middle_ranks.__getitem__
+                )
+            middles_by_first_sums[first_sums] = middle_positions
+        
+        for middle_position in middle_positions:
+            if len(ranked) == max_results and first_bound + middle_scores[middle_position] < ranked[0][0]:
+                break
+            
+            vowel_sum, consonant_sum, _ = append_name_part(
+                append_name_part(first_sums, search['middle_part_sums'][middle_position]),
+                search['last_part_sums']
+            )
+            profile = get_profile_from_sums(vowel_sum, consonant_sum, search['life_path'])
+            master_numbers = get_master_numbers(profile, target_numbers, target_components)
+            score = (get_master_rank_score(master_numbers, weights) + first_scores[first_position]
+                     + middle_scores[middle_position])
+            
+            entry = (score, -(first_position * len(middle_names) + middle_position))
+            if len(ranked) < max_results:
+                heapq.heappush(ranked, entry)
+            elif entry > ranked[0]:
+                heapq.heapreplace(ranked, entry)
+    
+    results = []
+    for score, combination in sorted(ranked, reverse=True):
+        first_position, middle_position = divmod(-combination, len(middle_names))
+        name_sums = append_name_part(
+            append_name_part(append_name_part(NAME_START_SUMS, first_part_sums[first_position]),
+                             search['middle_part_sums'][middle_position]),
+            search['last_part_sums']
+        )
+        result = get_name_result(
+            first_names[first_position], middle_names[middle_position], last_name, name_sums,
+            search['life_path'], target_numbers, target_components
+        )
+        result['score'] = score
+        results.append(result)
     
-    print(f"\nSearch complete! Checked {combinations_checked} combinations.")
     return results
 
-def display_results(results):
-    """Display the found name combinations in a formatted way"""
-    if not results:
-        print("No name combinations found with the specified master numbers.")
-        return
+def get_corpus_fingerprint(first_names, middle_names):
+    """Return a SHA-256 hex digest identifying the first and middle name lists of a search"""
+    digest = hashlib.sha256()
+    for names in (first_names, middle_names):
+        for name in names:
+            digest.update(name.encode('utf-8') + b'\0')
+        digest.update(b'\1')
+    return digest.hexdigest()
+
+def read_export_checkpoint(checkpoint_path):
+    """Return the checkpoint saved at checkpoint_path, or None when there is none"""
+    try:
+        with open(checkpoint_path, encoding='utf-8') as checkpoint_file:
+            return json.load(checkpoint_file)
+    except FileNotFoundError:
+        return None
+
+def write_export_checkpoint(checkpoint_path, checkpoint):
+    """Replace the checkpoint at checkpoint_path atomically"""
+    temporary_path = checkpoint_path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+    os.replace(temporary_path, checkpoint_path)
+
+def export_first_name_matches(birth_date, first_names, middle_names, last_name, target_numbers, target_components,
+                              output_path, checkpoint_path, query, max_results=None, checkpoint_interval=10.0,
+                              progress=None):
+    """Write the matches of first_names × middle_names to output_path as JSONL, resuming from checkpoint_path
+
+    The checkpoint records the next (first_index, middle_index) to check and
+    the output size at that point. It is saved at most every
+    checkpoint_interval seconds, after the output is synced, and whenever the
+    export stops, including on errors and KeyboardInterrupt. A resumed export
+    truncates the output back to the checkpoint and carries on from its
+    position, so no match is written twice or lost. The export stops as
+    soon as max_results matches are written. query identifies the export; a
+    checkpoint saved for another query raises ValueError.
+    Returns the number of matches in the output.
+    """
+    checkpoint = read_export_checkpoint(checkpoint_path)
+    if checkpoint is None:
+        checkpoint = {'query': query, 'first_index': 0, 'middle_index': 0, 'output_offset': 0,
+                      'matches_found': 0, 'done': False}
+    elif checkpoint['query'] != query:
+        raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different export")
+    if checkpoint['done']:
+        return checkpoint['matches_found']
     
-    print(f"\n{'='*60}")
-    print(f" FOUND {len(results)} NAME COMBINATIONS WITH MASTER NUMBERS")
-    print(f"{'='*60}")
+    middle_count = len(middle_names)
+    combinations_done = checkpoint['first_index'] * middle_count + checkpoint['middle_index']
+    matches_found = checkpoint['matches_found']
+    first_start = checkpoint['first_index']
+    search = prepare_name_search(birth_date, middle_names, last_name, target_numbers, target_components)
+    
+    # Anything written after the last checkpoint is dropped and found again
+    output_offset = checkpoint['output_offset']
+    if output_offset == 0:
+        output = open(output_path, 'wb')
+    else:
+        output = open(output_path, 'r+b')
+        output.truncate(output_offset)
+        output.seek(output_offset)
+    
+    def save(done=False):
+        output.flush()
+        os.fsync(output.fileno())
+        first_index, middle_index = divmod(combinations_done, middle_count) if middle_count else (len(first_names), 0)
+        checkpoint.update(first_index=first_index, middle_index=middle_index, output_offset=output_offset,
+                          matches_found=matches_found, done=done)
+        write_export_checkpoint(checkpoint_path, checkpoint)
+    
+    last_save = time.monotonic()
+    
+    def first_name_done(combinations_checked, _):
+        nonlocal combinations_done, last_save
+        combinations_done = first_start * middle_count + combinations_checked
+        if progress is not None:
+            progress(combinations_done, matches_found)
+        if time.monotonic() - last_save >= checkpoint_interval:
+            save()
+            last_save = time.monotonic()
+    
+    matches = iter_first_name_matches(search, first_names[first_start:], first_name_done)
+    try:
+        if max_results is None or matches_found < max_results:
+            for combinations_checked, result in matches:
+                combination = first_start * middle_count + combinations_checked
+                if combination <= combinations_done:
+                    continue
+                
+                line = json.dumps(result).encode('utf-8') + b'\n'
+                output.write(line)
+                output_offset += len(line)
+                matches_found += 1
+                combinations_done = combination
+                if max_results is not None and matches_found >= max_results:
+                    break
+                if time.monotonic() - last_save >= checkpoint_interval:
+                    save()
+                    last_save = time.monotonic()
+        
+        combinations_done = len(first_names) * middle_count
+        save(done=True)
+    except BaseException:
+        save()
+        raise
+    finally:
+        matches.close()
+        output.close()
+    
+    return matches_found
+
+def merge_export_shards(shard_paths, shard_matches, output_path, max_results=None):
+    """Concatenate shard outputs in order into output_path, keeping the first max_results lines"""
+    remaining = max_results
+    temporary_path = output_path + '.tmp'
+    with open(temporary_path, 'wb') as output:
+        for shard_path, matches_found in zip(shard_paths, shard_matches):
+            with open(shard_path, 'rb') as shard_file:
+                if remaining is None or matches_found <= remaining:
+                    shutil.copyfileobj(shard_file, output)
+                else:
+                    output.writelines(itertools.islice(shard_file, remaining))
+            if remaining is not None:
+                remaining -= min(matches_found, remaining)
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(temporary_path, output_path)
+
+def export_master_number_names(birth_date, gender, last_name, output_path, target_numbers=[11, 22, 33],
+                               target_components=None, max_results=None, checkpoint_path=None,
+                               checkpoint_interval=10.0, workers=1, shards=None, progress=None,
+                               name_store=None, constraints=None):
+    """Write every match of a search to output_path as JSONL, checkpointing so it can be resumed
+
+    Calling it again with the same arguments after a crash or interrupt
+    resumes where the last checkpoint left off (default path:
+    output_path + '.checkpoint') and yields exactly the output of an
+    uninterrupted run, in the order of find_master_number_names. See
+    export_first_name_matches for the checkpoints. The checkpoint identifies
+    the search by its arguments and a get_corpus_fingerprint of the name
+    lists, so a changed corpus is not resumed.
+    
+    With shards (default: four per worker when workers is not 1) the first
+    names are split into that many ranges, each exported with its own output
+    and checkpoint file by a process pool of workers processes. The shard
+    outputs are merged into output_path once all are done. A resumed export
+    must use the same number of shards. progress is called as
+    progress(combinations_checked, matches_found), after every shard when sharded.
+    Returns the number of matches written.
+    """
+    if target_components is None:
+        target_components = ['life_path', 'soul_urge', 'expression', 'personality']
+    if checkpoint_path is None:
+        checkpoint_path = output_path + '.checkpoint'
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if shards is None:
+        shards = 1 if workers == 1 else workers * 4
+    
+    calculate_life_path(birth_date)
+    first_names, middle_names = get_name_lists(gender, name_store, constraints)
+    query = {
+        'birth_date': birth_date, 'gender': gender, 'last_name': last_name,
+        'target_numbers': list(target_numbers), 'target_components': list(target_components),
+        'max_results': max_results, 'first_names': len(first_names), 'middle_names': len(middle_names),
+        'corpus': get_corpus_fingerprint(first_names, middle_names)
+    }
+    
+    if shards <= 1:
+        return export_first_name_matches(
+            birth_date, first_names, middle_names, last_name, target_numbers, target_components,
+            output_path, checkpoint_path, dict(query, shard=[0, 1]), max_results, checkpoint_interval, progress
+        )
+    
+    query['shards'] = shards
+    shard_paths = [f"{output_path}.shard-{shard}" for shard in range(shards)]
+    shard_checkpoint_paths = [f"{checkpoint_path}.shard-{shard}" for shard in range(shards)]
+    
+    def remove_shard_files():
+        for path in shard_paths + shard_checkpoint_paths:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+    
+    checkpoint = read_export_checkpoint(checkpoint_path)
+    if checkpoint is not None:
+        if checkpoint['query'] != query:
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different export")
+        # The shard files may be left over from an export stopped right after merging
+        remove_shard_files()
+        return checkpoint['matches_found']
+    
+    shard_size = -(-len(first_names) // shards) if first_names else 0
+    middle_names = list(middle_names)
+    shard_jobs = []
+    for shard in range(shards):
+        shard_first_names = list(first_names[shard * shard_size:(shard + 1) * shard_size])
+        shard_jobs.append((
+            birth_date, shard_first_names, middle_names, last_name, target_numbers, target_components,
+            shard_paths[shard], shard_checkpoint_paths[shard], dict(query, shard=[shard, shards]),
+            max_results, checkpoint_interval
+        ))
+    
+    shard_matches = [None] * shards
+    combinations_checked = 0
+    
+    def shard_done(shard, matches_found):
+        nonlocal combinations_checked
+        shard_matches[shard] = matches_found
+        combinations_checked += len(shard_jobs[shard][1]) * len(middle_names)
+        if progress is not None:
+            progress(combinations_checked, sum(matches for matches in shard_matches if matches is not None))
+    
+    if workers == 1:
+        for shard, job in enumerate(shard_jobs):
+            shard_done(shard, export_first_name_matches(*job))
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        try:
+            # Only one shard per worker is submitted, so an interrupt stops
+            # every running shard and none is left queued behind it
+            jobs = enumerate(shard_jobs)
+            running = {}
+            while True:
+                for shard, job in itertools.islice(jobs, workers - len(running)):
+                    running[executor.submit(export_first_name_matches, *job)] = shard
+                if not running:
+                    break
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    shard_done(running.pop(future), future.result())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    merge_export_shards(shard_paths, shard_matches, output_path, max_results)
+    matches_found = sum(shard_matches) if max_results is None else min(sum(shard_matches), max_results)
+    write_export_checkpoint(checkpoint_path, {'query': query, 'matches_found': matches_found, 'done': True})
+    remove_shard_files()
+    return matches_found
+
+def _convolve_sum_histograms(first_histogram, middle_histogram):
+    """Convolve two {(vowel_sum, consonant_sum): count} histograms into one over summed keys"""
+    if not first_histogram or not middle_histogram:
+        return {}
     
-    for i, result in enumerate(results, 1):
-        print(f"\n{i}. {result['full_name']}")
-        print(f"   Life Path: {result['profile']['life_path']}", end="")
-        if result['profile']['life_path'] in [11, 22, 33]:
-            print(" ✅")
+    if np is None:
+        totals = collections.Counter()
+        for (first_vowels, first_consonants), first_count in first_histogram.items():
+            for (middle_vowels, middle_consonants), middle_count in middle_histogram.items():
+                totals[(first_vowels + middle_vowels, first_consonants + middle_consonants)] += first_count * middle_count
+        return totals
+    
+    # Dense 2-D histograms convolved through the FFT; counts are integers, so rounding is exact
+    def dense(histogram):
+        dense_histogram = np.zeros((max(v for v, _ in histogram) + 1, max(c for _, c in histogram) + 1))
+        for (vowel_sum, consonant_sum), count in histogram.items():
+            dense_histogram[vowel_sum, consonant_sum] = count
+        return dense_histogram
+    
+    first_array = dense(first_histogram)
+    middle_array = dense(middle_histogram)
+    shape = (first_array.shape[0] + middle_array.shape[0] - 1, first_array.shape[1] + middle_array.shape[1] - 1)
+    convolved = np.fft.irfft2(np.fft.rfft2(first_array, shape) * np.fft.rfft2(middle_array, shape), shape)
+    counts = np.rint(convolved).astype(np.int64)
+    
+    vowel_sums, consonant_sums = np.nonzero(counts)
+    return {
+        (int(vowel_sum), int(consonant_sum)): int(counts[vowel_sum, consonant_sum])
+        for vowel_sum, consonant_sum in zip(vowel_sums, consonant_sums)
+    }
+
+def count_master_number_names(birth_date, gender, last_name, target_numbers=[11, 22, 33],
+                              target_components=None, name_store=None, constraints=None):
+    """Count first × middle combinations by component value without listing them
+
+    Returns a dict with the life path, the number of combinations, 'components'
+    ({component: {value: count}} for soul_urge, expression and personality),
+    'joint' ({(soul_urge, expression, personality): count}) and 'matches', the
+    number of combinations find_master_number_names would return for the
+    targets with an unlimited max_results.
+
+    Names are grouped into histograms of their letter sums (split by Y
+    behaviour) and the histograms are convolved, so the cost does not grow with
+    the number of combinations.
+    """
+    if target_components is None:
+        target_components = ['life_path', 'soul_urge', 'expression', 'personality']
+    
+    life_path = calculate_life_path(birth_date)
+    first_names, middle_names = get_name_lists(gender, name_store, constraints)
+    last_part_sums = get_name_part_sums(last_name)
+    
+    # {ends_with_vowel: {(vowel_sum, consonant_sum): count}} for first names
+    first_histograms = collections.defaultdict(collections.Counter)
+    for part_sums in iter_name_part_sums(first_names):
+        vowel_sum, consonant_sum, ends_with_vowel = append_name_part(NAME_START_SUMS, part_sums)
+        first_histograms[ends_with_vowel][(vowel_sum, consonant_sum)] += 1
+    
+    # {(starts_with_y, ends_with_vowel): {(vowel_sum, consonant_sum): count}} for middle names
+    middle_histograms = collections.defaultdict(collections.Counter)
+    for vowel_sum, consonant_sum, starts_with_y, ends_with_vowel in iter_name_part_sums(middle_names):
+        middle_histograms[(starts_with_y, ends_with_vowel)][(vowel_sum, consonant_sum)] += 1
+    
+    # Full name sums: every (first group, middle group) pair shares one Y correction
+    totals = collections.Counter()
+    for first_ends_with_vowel, first_histogram in first_histograms.items():
+        for (starts_with_y, ends_with_vowel), middle_histogram in middle_histograms.items():
+            vowel_offset, consonant_offset, _ = append_name_part(
+                append_name_part((0, 0, first_ends_with_vowel), (0, 0, starts_with_y, ends_with_vowel)),
+                last_part_sums
+            )
+            for (vowel_sum, consonant_sum), count in _convolve_sum_histograms(first_histogram, middle_histogram).items():
+                totals[(vowel_sum + vowel_offset, consonant_sum + consonant_offset)] += count
+    
+    components = {'soul_urge': collections.Counter(), 'expression': collections.Counter(),
+                  'personality': collections.Counter()}
+    joint = collections.Counter()
+    matches = 0
+    for (vowel_sum, consonant_sum), count in totals.items():
+        profile = get_profile_from_sums(vowel_sum, consonant_sum, life_path)
+        for component, counter in components.items():
+            counter[profile[component]] += count
+        joint[(profile['soul_urge'], profile['expression'], profile['personality'])] += count
+        if get_master_numbers(profile, target_numbers, target_components):
+            matches += count
+    
+    return {
+        'life_path': life_path,
+        'combinations': len(first_names) * len(middle_names),
+        'components': {component: dict(sorted(counter.items())) for component, counter in components.items()},
+        'joint': dict(sorted(joint.items())),
+        'matches': matches
+    }
+
+def get_name_part_choices(part, gender, name_store=None):
+    """Return (names, part_sums) for one part of a multi-part name shape
+
+    part is 'first' or 'middle' for the gender's name lists, a list of names,
+    or any other string as the one fixed name of that part.
+    """
+    if part in ('first', 'middle'):
+        first_names, middle_names = get_name_lists(gender, name_store)
+        names = first_names if part == 'first' else middle_names
+    elif isinstance(part, str):
+        names = [part]
+    else:
+        names = list(part)
+    return names, list(iter_name_part_sums(names))
+
+def get_name_half(choices, separators):
+    """Return [(names, part_sums)] for every combination of choices in list order
+
+    separators[i] is written before choices[i]; part_sums covers the text of
+    the whole combination, separators included.
+    """
+    empty_sums = get_name_part_sums('')
+    half = [((), empty_sums)]
+    for separator, (names, part_sums) in zip(separators, choices):
+        separator_sums = get_name_part_sums(separator)
+        half = [
+            (half_names + (name,), combine_name_part_sums(combine_name_part_sums(half_sums, separator_sums), sums))
+            for half_names, half_sums in half
+            for name, sums in zip(names, part_sums)
+        ]
+    return half
+
+def split_name_shape(sizes):
+    """Return where to split parts with the given list sizes so neither half has many more combinations"""
+    best_split = len(sizes)
+    best_size = None
+    for split in range(1, len(sizes) + 1):
+        left_size = math.prod(sizes[:split])
+        right_size = math.prod(sizes[split:])
+        if best_size is None or max(left_size, right_size) < best_size:
+            best_split, best_size = split, max(left_size, right_size)
+    return best_split
+
+def iter_multi_part_names(birth_date, gender, last_name, shape=('first', 'middle', 'middle'),
+                          separators=None, target_numbers=[11, 22, 33], target_components=None,
+                          name_store=None):
+    """Yield multi-part name combinations with master numbers as soon as each one is found
+
+    shape lists the parts written before the last name: 'first' or 'middle'
+    for the gender's name lists, a list of names, or a fixed name such as 'Rose'.
+    separators[i] goes between part i and part i + 1 and defaults to a space;
+    '-' makes hyphenated names, e.g. shape ('first', 'first', 'middle') with
+    separators ['-', ' '] gives names like "Mary-Ann Rose Young".
+    
+    The parts are split into two halves of similar size. Every combination of
+    the right half is indexed by its letter sums like the middle names of
+    find_master_number_names, and each left half combination is joined against
+    that index, so the work grows with the halves rather than their product.
+    Results come in the order of a nested loop over the parts.
+    """
+    if not shape:
+        raise ValueError("shape needs at least one name part")
+    if separators is None:
+        separators = [' '] * (len(shape) - 1)
+    if len(separators) != len(shape) - 1:
+        raise ValueError("separators needs one entry between each pair of name parts")
+    if target_components is None:
+        target_components = ['life_path', 'soul_urge', 'expression', 'personality']
+    
+    life_path = calculate_life_path(birth_date)
+    last_part_sums = get_name_part_sums(last_name)
+    choices = [get_name_part_choices(part, gender, name_store) for part in shape]
+    split = split_name_shape([len(names) for names, _ in choices])
+    
+    # The separator between the halves is written before the right half
+    separators = [''] + list(separators)
+    separator_sums = [get_name_part_sums(separator) for separator in separators]
+    right_half = get_name_half(choices[split:], separators[split:])
+    right_part_sums = [part_sums for _, part_sums in right_half]
+    if 'life_path' in target_components and life_path in target_numbers:
+        every_right_half = list(range(len(right_half)))
+        right_index = None
+    else:
+        right_index = index_name_parts(right_half, right_part_sums)
+    matches_by_left_sums = {}
+    
+    for left_half in itertools.product(*(zip(*choice) for choice in choices[:split])):
+        left_sums = get_name_part_sums('')
+        for part_separator_sums, (_, part_sums) in zip(separator_sums, left_half):
+            left_sums = combine_name_part_sums(combine_name_part_sums(left_sums, part_separator_sums), part_sums)
+        left_sums = append_name_part(NAME_START_SUMS, left_sums)
+        
+        if right_index is None:
+            right_positions = every_right_half
         else:
-            print()
+            right_positions = matches_by_left_sums.get(left_sums)
+            if right_positions is None:
+                right_positions = join_name_index(
+                    left_sums, right_index, last_part_sums, target_numbers, target_components
+                )
+                matches_by_left_sums[left_sums] = right_positions
+        
+        for right_position in right_positions:
+            right_names, right_sums = right_half[right_position]
+            vowel_sum, consonant_sum, _ = append_name_part(append_name_part(left_sums, right_sums), last_part_sums)
+            profile = get_profile_from_sums(vowel_sum, consonant_sum, life_path)
             
-        print(f"   Soul Urge: {result['profile']['soul_urge']}", end="")
-        if result['profile']['soul_urge'] in [11, 22, 33]:
-            print(" ✅")
+            name_parts = [name for name, _ in left_half] + list(right_names)
+            full_name = name_parts[0] + ''.join(
+                separator + name for separator, name in zip(separators[1:], name_parts[1:])
+            )
+            yield {
+                'full_name': f"{full_name} {last_name}",
+                'name_parts': name_parts,
+                'profile': profile,
+                'master_numbers': get_master_numbers(profile, target_numbers, target_components)
+            }
+
+def find_multi_part_names(birth_date, gender, last_name, shape=('first', 'middle', 'middle'),
+                          separators=None, target_numbers=[11, 22, 33], target_components=None,
+                          max_results=10, name_store=None):
+    """Find names of several parts (two middle names, hyphenated first names) with master numbers
+
+    See iter_multi_part_names for shape and separators.
+    """
+    return list(itertools.islice(
+        iter_multi_part_names(birth_date, gender, last_name, shape, separators, target_numbers,
+                              target_components, name_store),
+        max(0, max_results)
+    ))
+
+# Days covered by the precomputed life path calendar
+LIFE_PATH_CALENDAR_START = datetime.date(1800, 1, 1)
+LIFE_PATH_CALENDAR_END = datetime.date(2299, 12, 31)
+
+_life_path_calendar = None
+
+def get_life_path_calendar():
+    """Return the life path of every day from LIFE_PATH_CALENDAR_START to LIFE_PATH_CALENDAR_END
+
+    One byte per day, indexed by days since LIFE_PATH_CALENDAR_START. Built
+    on first use with the same per-part reduction as calculate_life_path.
+    """
+    global _life_path_calendar
+    if _life_path_calendar is None:
+        life_paths = bytearray()
+        for year in range(LIFE_PATH_CALENDAR_START.year, LIFE_PATH_CALENDAR_END.year + 1):
+            reduced_year = reduce_to_single_digit(sum(int(digit) for digit in str(year)))
+            for month in range(1, 13):
+                month_and_year = reduce_to_single_digit(month) + reduced_year
+                life_paths.extend(
+                    reduce_letter_sum(month_and_year + reduce_to_single_digit(day))
+                    for day in range(1, calendar.monthrange(year, month)[1] + 1)
+                )
+        _life_path_calendar = bytes(life_paths)
+    return _life_path_calendar
+
+def parse_birth_date(birth_date):
+    """Return a datetime.date for a MM-DD-YYYY or MM/DD/YYYY string (dates are passed through)"""
+    if isinstance(birth_date, datetime.date):
+        return birth_date
+    try:
+        separator = '-' if '-' in birth_date else '/'
+        month, day, year = (int(part) for part in birth_date.split(separator))
+        return datetime.date(year, month, day)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid date format. Please use MM-DD-YYYY or MM/DD/YYYY")
+
+def format_birth_date(date):
+    """Format a date the way calculate_life_path reads it (MM-DD-YYYY)"""
+    return f"{date.month:02d}-{date.day:02d}-{date.year:04d}"
+
+def iter_life_paths(start_date, end_date):
+    """Yield (date, life_path) for every day from start_date to end_date inclusive
+
+    Days inside the calendar are read from the precomputed table, others are
+    calculated one by one.
+    """
+    life_paths = get_life_path_calendar()
+    first_day = LIFE_PATH_CALENDAR_START.toordinal()
+    last_day = LIFE_PATH_CALENDAR_END.toordinal()
+    
+    day = start_date.toordinal()
+    end_day = end_date.toordinal()
+    while day <= end_day:
+        if first_day <= day <= last_day:
+            table_end = min(end_day, last_day)
+            for offset, life_path in enumerate(life_paths[day - first_day:table_end - first_day + 1]):
+                yield datetime.date.fromordinal(day + offset), life_path
+            day = table_end + 1
         else:
-            print()
-            
-        print(f"   Expression: {result['profile']['expression']}", end="")
-        if result['profile']['expression'] in [11, 22, 33]:
-            print(" ✅")
+            date = datetime.date.fromordinal(day)
+            yield date, calculate_life_path(format_birth_date(date))
+            day += 1
+
+def find_master_number_dates(full_name, start_date, end_date, target_numbers=[11, 22, 33],
+                             target_components=None, max_results=None):
+    """Find birth dates in a range that give a fixed full name master numbers
+
+    A date matches when its profile has a master number in any target
+    component, like find_master_number_names. Pass target_components=['life_path']
+    to only keep dates whose life path alone is a master number. Returns a list
+    of {'birth_date', 'profile', 'master_numbers'} dicts in date order.
+    """
+    if target_components is None:
+        target_components = ['life_path', 'soul_urge', 'expression', 'personality']
+    start_date = parse_birth_date(start_date)
+    end_date = parse_birth_date(end_date)
+    
+    name_masters = get_master_numbers(
+        calculate_profile(full_name).as_dict(), target_numbers,
+        [component for component in target_components if component != 'life_path']
+    )
+    # Without a name component hit only the life path can make a date match
+    life_path_targets = set(target_numbers) if 'life_path' in target_components else set()
+    
+    results = []
+    for date, life_path in iter_life_paths(start_date, end_date):
+        if max_results is not None and len(results) >= max_results:
+            break
+        if life_path not in life_path_targets and not name_masters:
+            continue
+        
+        profile = calculate_profile(full_name, life_path).as_dict()
+        results.append({
+            'birth_date': format_birth_date(date),
+            'profile': profile,
+            'master_numbers': get_master_numbers(profile, target_numbers, target_components)
+        })
+    
+    return results
+
+def normalize_gender(gender):
+    """Return 'male', 'female' or 'any' for a gender as accepted by get_name_lists"""
+    if gender.lower() in ['male', 'm', 'boy']:
+        return 'male'
+    elif gender.lower() in ['female', 'f', 'girl']:
+        return 'female'
+    return 'any'
+
+def parse_batch_query(record, default_max_results=10):
+    """Normalize one batch query record into search arguments
+
+    Accepts the JSONL or CSV form: target_numbers and target_components can be
+    lists or comma separated strings, with the same defaults as main().
+    Raises ValueError for an unusable query.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Query must be a JSON object")
+    
+    birth_date = str(record.get('birth_date') or '').strip()
+    last_name = str(record.get('last_name') or '').strip()
+    gender = str(record.get('gender') or '').strip()
+    if not birth_date or not last_name:
+        raise ValueError("Birth date and last name are required.")
+    
+    def as_list(value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(',') if item.strip()]
+        return list(value)
+    
+    try:
+        target_numbers = [int(number) for number in as_list(record.get('target_numbers'))]
+    except (TypeError, ValueError):
+        raise ValueError("target_numbers must be a list of master numbers")
+    target_numbers = [number for number in target_numbers if number in [11, 22, 33]] or [11, 22, 33]
+    
+    valid_components = ['life_path', 'soul_urge', 'expression', 'personality']
+    target_components = [component for component in as_list(record.get('target_components'))
+                         if component in valid_components] or valid_components
+    
+    max_results = record.get('max_results')
+    if max_results in (None, ''):
+        max_results = default_max_results
+    try:
+        max_results = int(max_results)
+    except (TypeError, ValueError):
+        raise ValueError("max_results must be an integer")
+    
+    return {
+        'birth_date': birth_date,
+        'gender': gender,
+        'last_name': last_name,
+        'target_numbers': target_numbers,
+        'target_components': target_components,
+        'max_results': max_results
+    }
+
+def read_batch_queries(query_file, file_format='jsonl'):
+    """Yield (line_number, record) from a JSONL or CSV query file one line at a time"""
+    if file_format == 'csv':
+        yield from enumerate(csv.DictReader(query_file), 2)
+        return
+    
+    for line_number, line in enumerate(query_file, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # Reported as an invalid query rather than stopping the batch
+            record = None
+        yield line_number, record
+
+def _lru_get(cache, key, compute, max_size):
+    """Return cache[key] from a bounded OrderedDict LRU cache, computing it when missing"""
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    value = cache[key] = compute()
+    if len(cache) > max_size:
+        cache.popitem(last=False)
+    return value
+
+def run_batch(queries, output, default_max_results=10, window_size=1000, cache_size=1024, name_store=None,
+              search_cache_size=16):
+    """Answer (line_number, record) queries, writing one JSON line per query to output
+
+    Queries are read window_size at a time and answered grouped by gender,
+    last name and birth date. The life path is computed once per distinct date,
+    letter sums once per distinct surname and the middle name index once per
+    gender, and searches with the same surname and life path share their
+    first name join results. Output keeps the input order. Memory stays
+    bounded by window_size, cache_size (dates and surnames) and
+    search_cache_size: each prepared search memoizes middle name positions per
+    first name sums, which can grow to the size of the whole corpus, so only a
+    few are kept. Grouping the window keeps the queries that share one search
+    back to back. Returns the number of queries read.
+    """
+    name_lists = {}
+    life_paths = collections.OrderedDict()
+    last_name_sums = collections.OrderedDict()
+    searches = collections.OrderedDict()
+    
+    def get_gender_lists(gender):
+        first_names, middle_names = get_name_lists(gender, name_store)
+        middle_part_sums = list(iter_name_part_sums(middle_names))
+        return first_names, middle_names, middle_part_sums, index_name_parts(middle_names, middle_part_sums)
+    
+    def get_life_path(birth_date):
+        # Invalid dates are cached as the error to report
+        try:
+            return calculate_life_path(birth_date)
+        except ValueError as error:
+            return error
+    
+    def start_answer(line_number, record):
+        answer_record = {'line': line_number}
+        if isinstance(record, dict) and 'id' in record:
+            answer_record['id'] = record['id']
+        return answer_record
+    
+    def answer(line_number, record, query):
+        gender = normalize_gender(query['gender'])
+        if gender not in name_lists:
+            name_lists[gender] = get_gender_lists(gender)
+        first_names, middle_names, middle_part_sums, middle_index = name_lists[gender]
+        
+        birth_date = query['birth_date']
+        life_path = _lru_get(life_paths, birth_date, lambda: get_life_path(birth_date), cache_size)
+        if isinstance(life_path, ValueError):
+            return dict(start_answer(line_number, record), error=str(life_path))
+        
+        last_name = query['last_name']
+        last_part_sums = _lru_get(last_name_sums, last_name, lambda: get_name_part_sums(last_name), cache_size)
+        
+        target_numbers = query['target_numbers']
+        target_components = query['target_components']
+        search = _lru_get(
+            searches,
+            (gender, last_name, life_path, tuple(target_numbers), tuple(target_components)),
+            lambda: prepare_name_search(
+                birth_date, middle_names, last_name, target_numbers, target_components,
+                life_path=life_path, last_part_sums=last_part_sums,
+                middle_part_sums=middle_part_sums, middle_index=middle_index
+            ),
+            search_cache_size
+        )
+        results, combinations_checked = collect_matches(
+            iter_first_name_matches(search, first_names), query['max_results'],
+            len(first_names) * len(middle_names)
+        )
+        
+        return dict(
+            start_answer(line_number, record),
+            query=query,
+            combinations_checked=combinations_checked,
+            results=results
+        )
+    
+    queries_read = 0
+    queries = iter(queries)
+    while True:
+        window = list(itertools.islice(queries, window_size))
+        if not window:
+            return queries_read
+        queries_read += len(window)
+        
+        answers = [None] * len(window)
+        parsed = []
+        for position, (line_number, record) in enumerate(window):
+            try:
+                parsed.append((position, parse_batch_query(record, default_max_results)))
+            except ValueError as error:
+                answers[position] = dict(start_answer(line_number, record), error=str(error))
+        
+        # Answer queries sharing a surname and date back to back so the caches hit
+        parsed.sort(key=lambda item: (
+            normalize_gender(item[1]['gender']), item[1]['last_name'], item[1]['birth_date']
+        ))
+        for position, query in parsed:
+            line_number, record = window[position]
+            answers[position] = answer(line_number, record, query)
+        
+        for answer_record in answers:
+            output.write(json.dumps(answer_record, ensure_ascii=False) + '\n')
+        output.flush()
+
+HTTP_STATUS_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+class NameSearchService:
+    """Asyncio HTTP front end for the name search
+
+    Searches run in an executor so the event loop keeps serving. Answers are
+    kept, already encoded, in a bounded LRU cache keyed on the normalized
+    query, and identical queries that arrive while one is running wait for
+    that computation instead of starting their own.
+
+    GET /search takes the batch query fields as query parameters (lists comma
+    separated), POST /search takes them as a JSON object. GET /stats reports
+    cache counters and GET /health always answers ok.
+    """
+    
+    def __init__(self, cache_size=1024, executor=None, name_store=None):
+        self.cache_size = cache_size
+        self.executor = executor
+        self.name_store = name_store
+        self.cache = collections.OrderedDict()
+        self.in_flight = {}
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
+    
+    def get_cache_key(self, query):
+        """Return the cache key of a query parsed by parse_batch_query
+
+        Results only depend on the birth date through its life path, and not
+        on the order of the target numbers, so both are normalized away.
+        """
+        return (
+            calculate_life_path(query['birth_date']),
+            normalize_gender(query['gender']),
+            query['last_name'],
+            tuple(sorted(set(query['target_numbers']))),
+            tuple(query['target_components']),
+            query['max_results']
+        )
+    
+    def run_search(self, query):
+        """Run one search and return its encoded JSON answer (called in the executor)"""
+        matches, combinations_total = iter_master_number_pairs(
+            query['birth_date'], query['gender'], query['last_name'],
+            query['target_numbers'], query['target_components'],
+            query['max_results'], name_store=self.name_store
+        )
+        results, combinations_checked = collect_matches(matches, query['max_results'], combinations_total)
+        return json.dumps({
+            'combinations_checked': combinations_checked,
+            'results': results
+        }, ensure_ascii=False).encode('utf-8')
+    
+    def _finish_search(self, key, future):
+        """Done callback: move a finished search from in_flight into the cache"""
+        del self.in_flight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.cache[key] = future.result()
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+    
+    async def search(self, record):
+        """Return (body, cache_state) for a query record; raises ValueError for a bad query"""
+        query = parse_batch_query(record)
+        key = self.get_cache_key(query)
+        
+        body = self.cache.get(key)
+        if body is not None:
+            self.cache.move_to_end(key)
+            self.stats['hits'] += 1
+            return body, 'hit'
+        
+        future = self.in_flight.get(key)
+        if future is None:
+            self.stats['misses'] += 1
+            cache_state = 'miss'
+            future = asyncio.get_running_loop().run_in_executor(self.executor, self.run_search, query)
+            self.in_flight[key] = future
+            future.add_done_callback(functools.partial(self._finish_search, key))
         else:
-            print()
-            
-        print(f"   Personality: {result['profile']['personality']}", end="")
-        if result['profile']['personality'] in [11, 22, 33]:
-            print(" ✅")
+            self.stats['coalesced'] += 1
+            cache_state = 'coalesced'
+        
+        # A client that disconnects must not cancel the search other clients wait on
+        return await asyncio.shield(future), cache_state
+    
+    async def handle_request(self, method, target, body):
+        """Return (status, body, headers) for one HTTP request"""
+        url = urllib.parse.urlsplit(target)
+        
+        if url.path == '/health':
+            return 200, b'{"status": "ok"}', {}
+        if url.path == '/stats':
+            stats = dict(self.stats, cached=len(self.cache), in_flight=len(self.in_flight))
+            return 200, json.dumps(stats).encode('utf-8'), {}
+        if url.path != '/search':
+            return 404, b'{"error": "Not found"}', {}
+        
+        if method == 'GET':
+            record = {name: values[-1] for name, values in urllib.parse.parse_qs(url.query).items()}
+        elif method == 'POST':
+            try:
+                record = json.loads(body or b'{}')
+            except ValueError:
+                return 400, b'{"error": "Request body must be JSON"}', {}
         else:
-            print()
+            return 405, b'{"error": "Method not allowed"}', {'Allow': 'GET, POST'}
+        
+        try:
+            response_body, cache_state = await self.search(record)
+        except ValueError as error:
+            return 400, json.dumps({'error': str(error)}).encode('utf-8'), {}
+        return 200, response_body, {'X-Cache': cache_state}
+    
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.x requests on one connection, keeping it alive when asked to"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                    body = await reader.readexactly(int(headers.get('content-length') or 0))
+                except ValueError:
+                    method, target, version, body = None, None, 'HTTP/1.0', b''
+                
+                if method is None:
+                    status, response_body, extra_headers = 400, b'{"error": "Bad request"}', {}
+                else:
+                    status, response_body, extra_headers = await self.handle_request(method, target, body)
+                
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+                response_headers = {
+                    'Content-Type': 'application/json; charset=utf-8',
+                    'Content-Length': str(len(response_body)),
+                    'Connection': 'keep-alive' if keep_alive else 'close',
+                    **extra_headers
+                }
+                head = f"HTTP/1.1 {status} {HTTP_STATUS_REASONS[status]}\r\n" + ''.join(
+                    f"{name}: {value}\r\n" for name, value in response_headers.items()
+                ) + "\r\n"
+                writer.write(head.encode('latin-1') + response_body)
+                await writer.drain()
+                
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+    
+    async def start(self, host='127.0.0.1', port=8080):
+        """Start listening and return the asyncio server"""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+def serve(host='127.0.0.1', port=8080, cache_size=1024, name_store=None):
+    """Run the HTTP search service until interrupted"""
+    async def run():
+        service = NameSearchService(cache_size, name_store=name_store)
+        server = await service.start(host, port)
+        print(f"Serving name searches on http://{host}:{port}/search", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+def display_result(index, result):
+    """Display one found name combination"""
+    print(f"\n{index}. {result['full_name']}")
+    print(f"   Life Path: {result['profile']['life_path']}", end="")
+    if result['profile']['life_path'] in [11, 22, 33]:
+        print(" ✅")
+    else:
+        print()
+        
+    print(f"   Soul Urge: {result['profile']['soul_urge']}", end="")
+    if result['profile']['soul_urge'] in [11, 22, 33]:
+        print(" ✅")
+    else:
+        print()
+        
+    print(f"   Expression: {result['profile']['expression']}", end="")
+    if result['profile']['expression'] in [11, 22, 33]:
+        print(" ✅")
+    else:
+        print()
+        
+    print(f"   Personality: {result['profile']['personality']}", end="")
+    if result['profile']['personality'] in [11, 22, 33]:
+        print(" ✅")
+    else:
+        print()
+
+def display_results(results):
+    """Display the found name combinations in a formatted way as they arrive
+
+    results can be a list or a lazy iterable such as iter_master_number_names.
+    Returns the number of results displayed.
+    """
+    count = 0
+    for count, result in enumerate(results, 1):
+        if count == 1:
+            print(f"\n{'='*60}")
+            print(" NAME COMBINATIONS WITH MASTER NUMBERS")
+            print(f"{'='*60}")
+        display_result(count, result)
+    
+    if not count:
+        print("No name combinations found with the specified master numbers.")
+        return count
+    
+    print(f"\n{'='*60}")
+    print(f" FOUND {count} NAME COMBINATIONS WITH MASTER NUMBERS")
+    print(f"{'='*60}")
+    return count
         
 def main():
     """Main function to run the master number name generator"""
@@ -398,13 +2531,14 @@ def main():
         print(f"Maximum results: {max_results}")
         print("-" * 60)
         
-        # Find matching names
-        results = find_master_number_names(
-            birth_date, gender, last_name, 
-            target_numbers, target_components, max_results
+        # Find matching names, displaying each one as soon as it is found
+        results = itertools.islice(
+            iter_master_number_names(
+                birth_date, gender, last_name, 
+                target_numbers, target_components
+            ),
+            max_results
         )
-        
-        # Display results
         display_results(results)
         
     except ValueError as e:
@@ -416,5 +2550,120 @@ def main():
         print(f"\nAn unexpected error occurred: {e}")
         print("Please try again.")
 
+def command_line(argv):
+    """Run a non-interactive command, see --help"""
+    parser = argparse.ArgumentParser(description="Master number name generator")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    batch_parser = commands.add_parser('batch', help="answer queries from a JSONL or CSV file as JSONL")
+    batch_parser.add_argument('input', help="query file with birth_date, gender, last_name and optional "
+                                            "target_numbers, target_components, max_results ('-' for stdin)")
+    batch_parser.add_argument('-o', '--output', default='-', help="JSONL output file (default: stdout)")
+    batch_parser.add_argument('--format', choices=['jsonl', 'csv'],
+                              help="input format (default: from the file extension, else jsonl)")
+    batch_parser.add_argument('--max-results', type=int, default=10,
+                              help="max_results for queries that do not set one (default: 10)")
+    batch_parser.add_argument('--window', type=int, default=1000,
+                              help="queries grouped and held in memory at once (default: 1000)")
+    batch_parser.add_argument('--name-store', help="name store file to use instead of the built-in names")
+    
+    serve_parser = commands.add_parser('serve', help="serve name searches over HTTP")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument('--port', type=int, default=8080, help="port to listen on (default: 8080)")
+    serve_parser.add_argument('--cache-size', type=int, default=1024,
+                              help="answers kept in the LRU cache (default: 1024)")
+    serve_parser.add_argument('--name-store', help="name store file to use instead of the built-in names")
+    
+    store_parser = commands.add_parser('build-store', help="build a name store file from a CSV of names")
+    store_parser.add_argument('csv', help="CSV with name, gender (M/F/U) and position (first/middle/both) columns")
+    store_parser.add_argument('store', help="name store file to write")
+    
+    export_parser = commands.add_parser('export', help="write every match to a JSONL file, resuming if interrupted")
+    export_parser.add_argument('birth_date', help="birth date (MM-DD-YYYY)")
+    export_parser.add_argument('gender', help="male, female or any")
+    export_parser.add_argument('last_name', help="last name")
+    export_parser.add_argument('output', help="JSONL output file")
+    export_parser.add_argument('--numbers', type=int, nargs='+', default=[11, 22, 33],
+                               help="master numbers to look for (default: 11 22 33)")
+    export_parser.add_argument('--components', nargs='+',
+                               choices=['life_path', 'soul_urge', 'expression', 'personality'],
+                               help="components to check (default: all)")
+    export_parser.add_argument('--max-results', type=int, help="stop after this many matches")
+    export_parser.add_argument('--checkpoint', help="checkpoint file (default: OUTPUT.checkpoint)")
+    export_parser.add_argument('--checkpoint-interval', type=float, default=10.0,
+                               help="seconds between checkpoints (default: 10)")
+    export_parser.add_argument('--workers', type=int, default=1, help="worker processes (0 for every CPU)")
+    export_parser.add_argument('--shards', type=int, help="first name shards (default: 4 per worker)")
+    export_parser.add_argument('--name-store', help="name store file to use instead of the built-in names")
+    
+    dates_parser = commands.add_parser('dates', help="list birth dates that give a full name master numbers")
+    dates_parser.add_argument('name', help="full name")
+    dates_parser.add_argument('start_date', help="first date (MM-DD-YYYY)")
+    dates_parser.add_argument('end_date', help="last date, inclusive (MM-DD-YYYY)")
+    dates_parser.add_argument('--numbers', type=int, nargs='+', default=[11, 22, 33],
+                              help="master numbers to look for (default: 11 22 33)")
+    dates_parser.add_argument('--components', nargs='+',
+                              choices=['life_path', 'soul_urge', 'expression', 'personality'],
+                              help="components to check (default: all)")
+    dates_parser.add_argument('--max-results', type=int, help="stop after this many dates")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'build-store':
+        name_count = build_name_store(args.csv, args.store)
+        print(f"Wrote {name_count} names to {args.store}", file=sys.stderr)
+        return 0
+    
+    if args.command == 'export':
+        name_store = NameStore.open(args.name_store) if args.name_store else None
+        try:
+            matches_found = export_master_number_names(
+                args.birth_date, args.gender, args.last_name, args.output, args.numbers, args.components,
+                args.max_results, args.checkpoint, args.checkpoint_interval, args.workers or None,
+                args.shards, name_store=name_store
+            )
+        except KeyboardInterrupt:
+            print("\nExport interrupted. Run the same command again to resume.", file=sys.stderr)
+            return 130
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Wrote {matches_found} matches to {args.output}", file=sys.stderr)
+        return 0
+    
+    if args.command == 'dates':
+        results = find_master_number_dates(
+            args.name, args.start_date, args.end_date, args.numbers, args.components, args.max_results
+        )
+        for result in results:
+            print(json.dumps(result))
+        print(f"Found {len(results)} dates.", file=sys.stderr)
+        return 0
+    
+    if args.command == 'serve':
+        name_store = NameStore.open(args.name_store) if args.name_store else None
+        serve(args.host, args.port, max(1, args.cache_size), name_store)
+        return 0
+    
+    file_format = args.format or ('csv' if args.input.lower().endswith('.csv') else 'jsonl')
+    name_store = NameStore.open(args.name_store) if args.name_store else None
+    query_file = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        queries_read = run_batch(
+            read_batch_queries(query_file, file_format), output,
+            args.max_results, max(1, args.window), name_store=name_store
+        )
+    finally:
+        if query_file is not sys.stdin:
+            query_file.close()
+        if output is not sys.stdout:
+            output.close()
+    
+    print(f"Answered {queries_read} queries.", file=sys.stderr)
+    return 0
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(command_line(sys.argv[1:]))
     main()
@@ -0,0 +1,345 @@
+import io
+import itertools
+import json
+import random
+
+import pytest
+
+import name_generator
+
+# Names exercising the Y rule, separators, non-ASCII text and whitespace
+KERNEL_NAMES = [
+    "", " ", "Y", "Yy", "YYY", "Amy", "Ayla", "Kyle", "Lynn", "Yolanda", "Maya", "Bryony",
+    "Mary-Yvonne", "O'Yates", "Ann-Y", "D'Y", "y-y", "Zoë", "Chloé", "Yusuf Öz", "Ægir",
+    "Straße", "ßy", "Ann\tYoung", "Ty\tY", "A Y", "E  Y", "Åsa-Ylva", "María José", "日本 Yu",
+]
+
+def get_reference_part_sums(name):
+    """Vowel and consonant sums from the original get_vowels/get_consonants"""
+    vowel_sum = sum(name_generator.get_letter_value(letter) for letter in name_generator.get_vowels(name))
+    consonant_sum = sum(name_generator.get_letter_value(letter) for letter in name_generator.get_consonants(name))
+    return vowel_sum, consonant_sum
+
+def get_random_names(count, seed=0):
+    rng = random.Random(seed)
+    alphabet = "AEIOUYyaeiouBCDKLMNRSTbcdklmnrst -'\tÉéßÖ日"
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) for _ in range(count)]
+
+def test_profile_kernel_matches_component_functions():
+    for name in KERNEL_NAMES + get_random_names(2000):
+        profile = name_generator.calculate_profile(name, 7)
+        assert profile.as_tuple() == (
+            7,
+            name_generator.calculate_soul_urge(name),
+            name_generator.calculate_expression(name),
+            name_generator.calculate_personality(name)
+        ), repr(name)
+
+def test_name_part_sums_match_vowels_and_consonants():
+    for name in KERNEL_NAMES + get_random_names(2000, seed=1):
+        vowel_sum, consonant_sum, starts_with_y, ends_with_vowel = name_generator.get_name_part_sums(name)
+        assert (vowel_sum, consonant_sum) == get_reference_part_sums(name), repr(name)
+
+        letters = name.upper().replace(' ', '')
+        assert starts_with_y == letters.startswith('Y'), repr(name)
+        assert ends_with_vowel == (letters[-1] in 'AEIOU' if letters else None), repr(name)
+
+def test_numerology_profile_dict():
+    assert name_generator.calculate_numerology_profile("Mary-Yvonne Young", "11-29-1990") == {
+        'life_path': name_generator.calculate_life_path("11-29-1990"),
+        'soul_urge': name_generator.calculate_soul_urge("Mary-Yvonne Young"),
+        'expression': name_generator.calculate_expression("Mary-Yvonne Young"),
+        'personality': name_generator.calculate_personality("Mary-Yvonne Young")
+    }
+
+# First and middle names with every Y behaviour at the name boundaries
+SEARCH_NAMES = ["Amy", "Kay", "Ty", "Yves", "Yara", "Lynn", "Eli", "Bo", "Mary-Ann", "O'Neil",
+                "Zoë", "Y", "", "Ayla", "Bryce", "Joy", "Yusuf", "Ivy", "Sky", "Noah"]
+
+def get_reference_profile(full_name, birth_date):
+    return {
+        'life_path': name_generator.calculate_life_path(birth_date),
+        'soul_urge': name_generator.calculate_soul_urge(full_name),
+        'expression': name_generator.calculate_expression(full_name),
+        'personality': name_generator.calculate_personality(full_name)
+    }
+
+def find_reference_names(birth_date, first_names, middle_names, last_name, target_numbers,
+                         target_components, max_results):
+    """The original nested loop of find_master_number_names"""
+    results = []
+    for first_name in first_names:
+        for middle_name in middle_names:
+            if len(results) >= max_results:
+                return results
+            full_name = f"{first_name} {middle_name} {last_name}"
+            profile = get_reference_profile(full_name, birth_date)
+            master_numbers_found = [
+                (component, profile[component]) for component in target_components
+                if profile[component] in target_numbers
+            ]
+            if master_numbers_found:
+                results.append({
+                    'full_name': full_name,
+                    'first_name': first_name,
+                    'middle_name': middle_name,
+                    'profile': profile,
+                    'master_numbers': master_numbers_found
+                })
+    return results
+
+def get_search_store(seed):
+    rng = random.Random(seed)
+    return name_generator.NameStore.from_lists({
+        key: rng.sample(SEARCH_NAMES, rng.randint(8, len(SEARCH_NAMES)))
+        for key in name_generator.NAME_STORE_LISTS
+    })
+
+def test_find_master_number_names_matches_nested_loop():
+    rng = random.Random(2)
+    components = ['life_path', 'soul_urge', 'expression', 'personality']
+    for case in range(150):
+        name_store = get_search_store(case)
+        gender = rng.choice(['m', 'f', 'any'])
+        last_name = rng.choice(["Young", "Ayers", "", "Y", "Lee"])
+        # 02-07-2000 and 09-29-2000 have master number life paths (11 and 22)
+        birth_date = rng.choice(["11-29-1990", "02-09-2000", "07-04-1976", "02-07-2000", "09-29-2000"])
+        target_numbers = rng.choice([[11, 22, 33], [11], [22, 33], [3, 11]])
+        target_components = rng.sample(components, rng.randint(1, 4))
+        max_results = rng.choice([0, 1, 7, 10 ** 6])
+
+        first_names, middle_names = name_store.get_name_lists(gender)
+        expected = find_reference_names(birth_date, list(first_names), list(middle_names), last_name,
+                                        target_numbers, target_components, max_results)
+        assert name_generator.find_master_number_names(
+            birth_date, gender, last_name, target_numbers, target_components, max_results,
+            name_store=name_store
+        ) == expected, case
+
+def test_find_master_number_names_matches_nested_loop_on_builtin_names():
+    first_names, middle_names = name_generator.get_name_lists('f')
+    for last_name, target_components in [("Young", ['personality']), ("Ayers", ['soul_urge', 'expression'])]:
+        expected = find_reference_names("11-29-1990", first_names, middle_names, last_name,
+                                        [11, 22, 33], target_components, 10 ** 6)
+        assert name_generator.find_master_number_names(
+            "11-29-1990", 'f', last_name, [11, 22, 33], target_components, 10 ** 6
+        ) == expected
+
+def test_parallel_search_matches_nested_loop():
+    name_store = get_search_store(3)
+    first_names, middle_names = name_store.get_name_lists('any')
+    expected = find_reference_names("11-29-1990", list(first_names), list(middle_names), "Young",
+                                    [11, 22, 33], ['soul_urge', 'expression', 'personality'], 50)
+    for workers in [1, 2]:
+        assert name_generator.find_master_number_names(
+            "11-29-1990", 'any', "Young", [11, 22, 33], ['soul_urge', 'expression', 'personality'], 50,
+            workers=workers, chunk_size=3, name_store=name_store
+        ) == expected
+
+def test_batch_answers_match_find_with_small_search_cache():
+    name_store = get_search_store(4)
+    rng = random.Random(4)
+    records = [
+        {
+            'birth_date': rng.choice(["11-29-1990", "02-07-2000", "07-04-1976"]),
+            'gender': rng.choice(['m', 'f', '']),
+            'last_name': rng.choice(["Young", "Ayers", "Lee", "Y"]),
+            'target_components': rng.choice([None, ['soul_urge'], ['expression', 'personality']]),
+            'max_results': rng.choice([1, 5, 1000])
+        }
+        for _ in range(60)
+    ]
+    output = io.StringIO()
+    name_generator.run_batch(enumerate(records, 1), output, window_size=25, name_store=name_store,
+                             search_cache_size=2)
+
+    for record, line in zip(records, output.getvalue().splitlines()):
+        query = name_generator.parse_batch_query(record)
+        expected = name_generator.find_master_number_names(
+            query['birth_date'], query['gender'], query['last_name'], query['target_numbers'],
+            query['target_components'], query['max_results'], name_store=name_store
+        )
+        assert json.loads(line)['results'] == json.loads(json.dumps(expected))
+
+def test_metrics_sink_needs_only_emit():
+    class ListSink:
+        def __init__(self):
+            self.events = []
+
+        def emit(self, event):
+            self.events.append(event)
+
+    sink = ListSink()
+    results = name_generator.find_master_number_names("11-29-1990", 'm', "Young", max_results=3, metrics_sink=sink)
+    assert len(results) == 3
+    assert [event['event'] for event in sink.events] == ['search']
+    assert sink.events[0]['counters']['matches_found'] == 3
+
+def test_multi_part_names_match_nested_loop():
+    rng = random.Random(5)
+    components = ['life_path', 'soul_urge', 'expression', 'personality']
+    for case in range(120):
+        parts = [rng.sample(SEARCH_NAMES, rng.randint(1, 5)) for _ in range(rng.randint(1, 4))]
+        separators = [rng.choice([' ', '-', "'"]) for _ in parts[1:]]
+        last_name = rng.choice(["Young", "Ayers", "", "Y"])
+        birth_date = rng.choice(["11-29-1990", "02-07-2000", "09-29-2000"])
+        target_numbers = rng.choice([[11, 22, 33], [11], [3, 7]])
+        target_components = rng.sample(components, rng.randint(1, 4))
+
+        expected = []
+        for names in itertools.product(*parts):
+            full_name = names[0] + ''.join(separator + name for separator, name in zip(separators, names[1:]))
+            full_name = f"{full_name} {last_name}"
+            profile = get_reference_profile(full_name, birth_date)
+            master_numbers_found = [
+                (component, profile[component]) for component in target_components
+                if profile[component] in target_numbers
+            ]
+            if master_numbers_found:
+                expected.append({
+                    'full_name': full_name,
+                    'name_parts': list(names),
+                    'profile': profile,
+                    'master_numbers': master_numbers_found
+                })
+
+        assert list(name_generator.iter_multi_part_names(
+            birth_date, 'any', last_name, parts, separators, target_numbers, target_components
+        )) == expected, case
+
+def test_multi_part_shape_takes_fixed_names():
+    results = name_generator.find_multi_part_names(
+        "11-29-1990", 'f', "Young", ('first', 'Rose'), target_components=['expression'], max_results=10 ** 6
+    )
+    assert results
+    assert {tuple(result['name_parts'][1:]) for result in results} == {('Rose',)}
+
+def test_ranked_search_matches_sorted_matches():
+    rng = random.Random(6)
+    for case in range(20):
+        name_store = get_search_store(case)
+        popularity = {name: rng.random() for name in rng.sample(SEARCH_NAMES, 10)}
+        target_components = rng.choice([None, ['soul_urge', 'personality'], ['expression']])
+        max_results = rng.choice([1, 5, 50])
+        birth_date = rng.choice(["11-29-1990", "02-07-2000"])
+        weights = dict(name_generator.RANK_WEIGHTS)
+
+        matches = name_generator.find_master_number_names(
+            birth_date, 'any', "Young", [11, 22, 33], target_components, 10 ** 6, name_store=name_store
+        )
+        for result in matches:
+            result['score'] = (
+                name_generator.get_master_rank_score(result['master_numbers'], weights)
+                + name_generator.get_name_rank_score(result['first_name'], popularity, weights)
+                + name_generator.get_name_rank_score(result['middle_name'], popularity, weights)
+            )
+        expected = sorted(matches, key=lambda result: -result['score'])[:max_results]
+
+        assert name_generator.find_ranked_master_number_names(
+            birth_date, 'any', "Young", [11, 22, 33], target_components, max_results, popularity,
+            name_store=name_store
+        ) == expected, case
+
+def test_constraints_match_filtered_search():
+    rng = random.Random(7)
+
+    def get_part_constraints():
+        return rng.choice([
+            None,
+            name_generator.NamePartConstraints(initials=rng.choice(['y', 'AB', 'KLMN'])),
+            name_generator.NamePartConstraints(min_length=3, max_length=rng.randint(3, 5), exclude=['Amy']),
+            name_generator.NamePartConstraints(names=rng.sample(SEARCH_NAMES, 4) + ['Rosalind']),
+        ])
+
+    for case in range(40):
+        name_store = get_search_store(case)
+        constraints = name_generator.NameConstraints(get_part_constraints(), get_part_constraints())
+        results = name_generator.find_master_number_names(
+            "11-29-1990", 'any', "Young", max_results=10 ** 6, name_store=name_store, constraints=constraints
+        )
+
+        def select(part, names):
+            if part is None:
+                return list(names)
+            names = list(names)
+            extra_names = [name for name in part.names or [] if name not in names and part.accepts(name)]
+            return [name for name in names if part.accepts(name)] + extra_names
+
+        first_names, middle_names = name_store.get_name_lists('any')
+        first_names = select(constraints.first, first_names)
+        middle_names = select(constraints.middle, middle_names)
+        assert results == find_reference_names(
+            "11-29-1990", first_names, middle_names, "Young", [11, 22, 33],
+            ['life_path', 'soul_urge', 'expression', 'personality'], 10 ** 6
+        ), case
+        assert set(name_store.name_list_indexes) == {'any'}
+
+class StopExport(Exception):
+    pass
+
+def run_interrupted_export(output_path, name_store, stop_every, **options):
+    """Run an export, stopping it from its progress callback until it completes; return the run count"""
+    calls = 0
+
+    def progress(combinations_checked, matches_found):
+        nonlocal calls
+        calls += 1
+        if calls % stop_every == 0:
+            raise StopExport
+
+    runs = 0
+    while True:
+        runs += 1
+        try:
+            name_generator.export_master_number_names(
+                "11-29-1990", 'any', "Young", str(output_path), [11, 22, 33], None,
+                progress=progress, name_store=name_store, **options
+            )
+            return runs
+        except StopExport:
+            pass
+
+def test_export_resumes_without_duplicates_or_gaps(tmp_path):
+    name_store = get_search_store(8)
+    expected = (tmp_path / 'expected.jsonl')
+    name_generator.export_master_number_names("11-29-1990", 'any', "Young", str(expected), name_store=name_store)
+    expected_lines = expected.read_text(encoding='utf-8').splitlines()
+    assert expected_lines == [
+        json.dumps(result) for result in name_generator.find_master_number_names(
+            "11-29-1990", 'any', "Young", max_results=10 ** 6, name_store=name_store
+        )
+    ]
+
+    for name, stop_every, options in [
+        ('single.jsonl', 3, {'checkpoint_interval': 0.0}),
+        ('single_rare.jsonl', 5, {'checkpoint_interval': 10.0}),
+        ('sharded.jsonl', 2, {'shards': 5, 'checkpoint_interval': 0.0}),
+    ]:
+        output_path = tmp_path / name
+        assert run_interrupted_export(output_path, name_store, stop_every, **options) > 1
+        assert output_path.read_text(encoding='utf-8').splitlines() == expected_lines, name
+        assert sorted(path.name for path in tmp_path.glob(name + '*')) == [name, name + '.checkpoint']
+
+def test_export_stops_at_max_results(tmp_path):
+    name_store = get_search_store(9)
+    output_path = tmp_path / 'limited.jsonl'
+    checked = []
+    name_generator.export_master_number_names(
+        "11-29-1990", 'any', "Young", str(output_path), max_results=3, name_store=name_store,
+        progress=lambda combinations_checked, matches_found: checked.append(combinations_checked)
+    )
+    first_names, middle_names = name_store.get_name_lists('any')
+    assert len(output_path.read_text(encoding='utf-8').splitlines()) == 3
+    assert len(checked) < len(first_names)
+
+def test_export_rejects_checkpoint_of_another_corpus(tmp_path):
+    output_path = str(tmp_path / 'corpus.jsonl')
+    name_generator.export_master_number_names("11-29-1990", 'any', "Young", output_path,
+                                              name_store=get_search_store(10))
+    other_store = name_generator.NameStore.from_lists({
+        key: [name[::-1] for name in names]
+        for key, names in zip(name_generator.NAME_STORE_LISTS,
+                              (list(get_search_store(10).get_names(*key)) for key in name_generator.NAME_STORE_LISTS))
+    })
+    with pytest.raises(ValueError):
+        name_generator.export_master_number_names("11-29-1990", 'any', "Young", output_path, name_store=other_store)